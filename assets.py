@@ -0,0 +1,69 @@
+#Import relevant libraries
+import threading
+from config import *
+
+# Define a class that loads assets on a background thread and reports its progress
+class AssetLoader:
+    def __init__(self):
+        # The assets to load in order, as (name, function, arguments)
+        self.jobs = []
+        self.assets = {}
+        self.errors = {}
+        self.thread = None
+        self.lock = threading.Lock()
+        self.finished = threading.Event()
+
+    # Define a method to add an asset to load
+    def add(self, name, function, *args):
+        self.jobs.append((name, function, args))
+
+    # Define a method to start loading the assets in the background
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.load, daemon=True)
+            self.thread.start()
+
+    # Define a method that loads every asset, runs on the background thread
+    def load(self):
+        for name, function, args in self.jobs:
+            try:
+                asset = function(*args)
+            except Exception as error:
+                # Keep the error so it is raised when the asset is used
+                with self.lock:
+                    self.errors[name] = error
+            else:
+                with self.lock:
+                    self.assets[name] = asset
+        self.finished.set()
+
+    # Define a method to check if an asset has been loaded
+    def ready(self, name):
+        with self.lock:
+            return name in self.assets or name in self.errors
+
+    # Define a method that returns how much of the assets have been loaded, from 0 to 1
+    def progress(self):
+        if not self.jobs:
+            return 1
+        with self.lock:
+            return (len(self.assets) + len(self.errors)) / len(self.jobs)
+
+    # Define a method to check if every asset has been loaded
+    def done(self):
+        return self.finished.is_set()
+
+    # Define a method to wait for an asset and return it
+    def get(self, name):
+        self.start()
+        while not self.ready(name):
+            self.finished.wait(0.01)
+        with self.lock:
+            if name in self.errors:
+                raise self.errors[name]
+            return self.assets[name]
+
+    # Define a method to wait for every asset and set them as attributes of an object
+    def install(self, target):
+        for name, function, args in self.jobs:
+            setattr(target, name, self.get(name))
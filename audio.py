@@ -0,0 +1,84 @@
+#Import relevant libraries
+import pygame
+from simulation import SilentSound
+from config import *
+
+# Define a class for a long music track that is streamed from its file instead of decoded into memory
+class MusicTrack:
+    # The track that is loaded into pygame.mixer.music, only one can play at a time
+    current = None
+
+    def __init__(self, path, volume=1):
+        self.path = path
+        self.volume = volume
+        self.missing = False
+
+    # Define a method to start streaming the track, the same way pygame.mixer.Sound is played
+    def play(self, loops=0):
+        if self.missing:
+            return
+        try:
+            pygame.mixer.music.load(self.path)
+        except pygame.error as error:
+            # Play on without the track instead of crashing the game
+            print(f"Can't play music: {error}")
+            self.missing = True
+            return
+        MusicTrack.current = self
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops)
+
+    # Define a method to stop the track if it is the one playing
+    def stop(self):
+        if MusicTrack.current is self:
+            pygame.mixer.music.stop()
+            MusicTrack.current = None
+
+    # Define a method to set the volume of the track
+    def set_volume(self, volume):
+        self.volume = volume
+        if MusicTrack.current is self:
+            pygame.mixer.music.set_volume(volume)
+
+# Define a class that keeps the short sound effects in memory and streams the music
+class AudioManager:
+    def __init__(self):
+        self.tracks = {}
+        self.effects = {}
+
+    # Define a method to add a music track, nothing is read from the file until it plays
+    def addMusic(self, name, path, volume=1):
+        track = MusicTrack(path, volume)
+        self.tracks[name] = track
+        return track
+
+    # Define a method to load a sound effect into memory
+    def addEffect(self, name, path, volume=1):
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as error:
+            # Play on without the effect instead of crashing the game
+            print(f"Can't load sound effect: {error}")
+            sound = SilentSound()
+        sound.set_volume(volume)
+        self.effects[name] = sound
+        return sound
+
+    # Define a method to stop every effect and the music
+    def stop(self):
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+            pygame.mixer.music.stop()
+        MusicTrack.current = None
+
+    # Define a method that returns how many bytes of decoded audio are kept in memory
+    def residentBytes(self):
+        if not pygame.mixer.get_init():
+            return 0
+        frequency, size, channels = pygame.mixer.get_init()
+        sample_bytes = abs(size) // 8 * channels
+        total = 0
+        for sound in self.effects.values():
+            if isinstance(sound, pygame.mixer.Sound):
+                total += round(sound.get_length() * frequency) * sample_bytes
+        return total
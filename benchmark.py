@@ -0,0 +1,226 @@
+#Import relevant libraries
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from main import Game
+from sprites import *
+from tiles import *
+from maze import *
+from records import *
+from video import *
+from config import *
+
+# Define a function to time a function, returning the duration of every run in milliseconds
+def measure(function, repeat, setup=None):
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+# Define a function to summarize the durations of a benchmark into a result
+def result(name, durations, **params):
+    return {"name": name,
+            "params": params,
+            "runs": len(durations),
+            "median_ms": statistics.median(durations),
+            "mean_ms": statistics.fmean(durations),
+            "min_ms": min(durations)}
+
+# Define a function to count the garbage collections run so far, to see how much garbage a benchmark leaves
+def gcRuns():
+    return sum(generation["collections"] for generation in gc.get_stats())
+
+# Define a function to create a square maze level with the player and enemy in opposite corners
+def makeLevel(size, seed=0):
+    grid = generateMaze(size, size, (0, 0), seed)
+    corner = (size - 1) // 2 * 2
+    return Level(grid, (0, 0), (corner, corner), size)
+
+# Define a function to start a game on a level with a number of enemies on random paths
+def startGame(game, level, enemies, seed=0):
+    game.new(level, seed)
+    game.swarm.add(game.randomPaths(enemies - 1))
+    game.swarm.loadPlanner()
+
+# Define a function to play until the player runs into an enemy and return how long the jumpscare took to show, in milliseconds
+def dieOnce(game, level, seed=0):
+    startGame(game, level, 1, seed)
+    game.swarm.x[0], game.swarm.y[0] = game.player.rect.topleft
+    game.swarm.sortCells()
+    while game.playing:
+        game.frame()
+    game.startJumpscare()
+    return game.jumpscare_latency * 1000
+
+# Define a function to time launching the game in a new Python process until it has drawn the intro screen, in milliseconds
+def launch():
+    environment = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profile.json")
+        start = time.time()
+        # The game measures the first frame of the intro screen in its profiler, which is saved for reading here
+        subprocess.run([sys.executable, "-c", "import sys, main; game = main.Game(headless=True); game.introMenu(); game.profiler.dump(sys.argv[1])", path],
+                       check=True, stdout=subprocess.DEVNULL, env=environment, cwd=os.path.dirname(os.path.abspath(__file__)))
+        with open(path) as file:
+            measurements = json.load(file)["measurements"]
+    shown = next(measurement["time"] for measurement in measurements if measurement["name"] == "launch_ms")
+    return (shown - start) * 1000
+
+# Define a function to run every benchmark and return the results
+def run(game, sizes, enemy_counts, repeat, frames, runs):
+    results = []
+
+    # Starting the game up to the intro screen, heavy libraries should only be imported once they are used
+    results.append(result("launch_to_intro", [launch() for _ in range(repeat)]))
+
+    # Maze generation for the game and for every size
+    seeds = iter(range(repeat))
+    results.append(result("game_generate_maze", measure(lambda: game.generateMaze(next(seeds)), repeat)))
+    for size in sizes:
+        seeds = iter(range(repeat))
+        results.append(result("generate_maze", measure(lambda: generateMaze(size, size, (0, 0), next(seeds)), repeat), size=size))
+
+    # Importing the maze into the tilemap
+    grid = game.generateMaze(0)
+    results.append(result("convert_maze", measure(lambda: game.convertMaze(grid), repeat)))
+
+    # Building the sprites of a level for every size
+    for size in sizes:
+        game.level = makeLevel(size)
+        results.append(result("create_tilemap", measure(game.createTilemap, repeat, game.createGroups), size=size))
+
+    # Starting a new game on a level, the player of the last game is moved into place and the walls are read from the grid
+    for size in sizes:
+        level = makeLevel(size)
+        game.new(level, 0)
+        before = gcRuns()
+        durations = measure(lambda: game.new(level, 0), repeat)
+        results.append(dict(result("restart", durations, size=size), gc_runs=gcRuns() - before))
+
+    # Measuring the distances to the player for hunting enemies, from a different path tile every time
+    for size in sizes:
+        field = DistanceField(makeLevel(size).grid)
+        sources = iter(map(tuple, np.argwhere(field.open)[::7].tolist() * repeat))
+        results.append(result("distance_update", measure(lambda: field.update(next(sources)), repeat), size=size))
+
+    # Bringing in the next band of an endless level
+    game.new(EndlessLevel(0), 0)
+    results.append(result("endless_descend", measure(game.descend, repeat)))
+
+    # Cutting and scaling a frame, with an empty cache and with the frame cached
+    results.append(result("get_sprite_miss", measure(lambda: game.character_spritesheet.getSprite(0, 0, RENDER_SIZE, RENDER_SIZE, PLAYER_RATIO),
+                                                     repeat, Spritesheet.cache.clear)))
+    results.append(result("get_sprite_hit", measure(lambda: game.character_spritesheet.getSprite(0, 0, RENDER_SIZE, RENDER_SIZE, PLAYER_RATIO),
+                                                    repeat)))
+
+    # Updating the actors and whole frames for every size and number of enemies
+    for size in sizes:
+        level = makeLevel(size)
+        for enemies in enemy_counts:
+            startGame(game, level, enemies)
+            results.append(result("player_update", measure(game.player.update, frames), size=size, enemies=enemies))
+
+            startGame(game, level, enemies)
+            results.append(result("enemy_update", measure(game.swarm.update, frames), size=size, enemies=enemies))
+
+            # Finding the enemies the player hears
+            center = game.player.rect.center
+            results.append(result("enemy_nearest", measure(lambda: game.swarm.nearest(*center, HEARTBEAT_THREATS, HEARTBEAT_RANGE * TILE_SIZE), frames),
+                                  size=size, enemies=enemies))
+
+            startGame(game, level, enemies)
+            results.append(result("frame", measure(lambda: (game.update(), game.draw()), frames), size=size, enemies=enemies))
+
+        # Dying to the first frame of the jumpscare, with a blank clip when the real one isn't loaded
+        clip = game.jumpscare
+        if clip is None:
+            game.jumpscare = FrameClip([pygame.Surface(JUMPSCARE_SIZE)] * JUMPSCARE_FPS, JUMPSCARE_FPS)
+        results.append(result("death_to_jumpscare", [dieOnce(game, level, seed) for seed in range(repeat)], size=size))
+        game.jumpscare = clip
+
+    # Leaderboard queries on a database with many recorded runs
+    with tempfile.TemporaryDirectory() as directory:
+        records = RecordStore(os.path.join(directory, "records.db"))
+        rng = random.Random(0)
+        for _ in range(runs):
+            records.add(f"player{rng.randrange(100)}", rng.uniform(30, 600))
+        records.flush()
+        results.append(result("records_top", measure(records.top, repeat), runs=runs))
+        results.append(result("records_best", measure(lambda: records.personalBest("player0"), repeat), runs=runs))
+        records.close()
+
+    return results
+
+# Define a function to write the results as JSON or CSV
+def write(results, file, format):
+    if format == "json":
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    else:
+        writer = csv.writer(file)
+        writer.writerow(["name", "params", "runs", "median_ms", "mean_ms", "min_ms", "gc_runs"])
+        for row in results:
+            params = ";".join(f"{key}={value}" for key, value in row["params"].items())
+            writer.writerow([row["name"], params, row["runs"], row["median_ms"], row["mean_ms"], row["min_ms"], row.get("gc_runs", "")])
+
+# Define a function to compare results against a baseline, returning the benchmarks that got slower
+def compare(results, baseline, threshold):
+    # Match benchmarks by name and parameters
+    def key(row):
+        return row["name"], json.dumps(row["params"], sort_keys=True)
+
+    previous = {key(row): row for row in baseline}
+    regressions = []
+    for row in results:
+        old = previous.get(key(row))
+        if old is None or old["median_ms"] <= 0:
+            continue
+        change = row["median_ms"] / old["median_ms"] - 1
+        if change > threshold:
+            regressions.append((row, old, change))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths of The Cryptwalker without a window")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 128, 256], help="maze sizes (tiles per side)")
+    parser.add_argument("--enemies", type=int, nargs="+", default=[1, 10, 50, 500], help="numbers of enemies")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of the setup benchmarks")
+    parser.add_argument("--frames", type=int, default=300, help="frames of the update benchmarks")
+    parser.add_argument("--runs", type=int, default=100000, help="recorded runs in the leaderboard database")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument("--output", help="file to write the results to (default: standard output)")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before a regression is flagged")
+    args = parser.parse_args()
+
+    game = Game(headless=True)
+    results = run(game, args.sizes, args.enemies, args.repeat, args.frames, args.runs)
+
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write(results, file, args.format)
+    else:
+        write(results, sys.stdout, args.format)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for row, old, change in regressions:
+            print(f"REGRESSION {row['name']} {row['params']}: {old['median_ms']:.3f} -> {row['median_ms']:.3f} ms (+{change:.0%})",
+                  file=sys.stderr)
+        # Fail so the change can be rejected
+        if regressions:
+            sys.exit(1)
@@ -5,12 +5,41 @@ TILE_SIZE = 160
 RENDER_SIZE = 32
 FPS = 60
 
+# Define how many frames per second are drawn while playing, the menus and jumpscare stay at FPS
+RENDER_FPS = 120
+
+# Define how many times a second the game logic runs, and how many ticks a frame may run to catch up
+TICK_RATE = 60
+MAX_TICKS_PER_FRAME = 5
+
 # Define constants for player and enemy speeds, as well as player and regular ratios
 PLAYER_SPEED = 8
 ENEMY_SPEED = 10
 PLAYER_RATIO = 0.75
 REGULAR_RATIO = 1
 
+# Define how many enemies roam the maze, the first one spawns at the enemy spawn and the rest on random paths
+ENEMY_COUNT = 1
+
+# Define the size (in tiles) of the cells enemies are sorted into for finding the ones near a point
+SPATIAL_CELL = 2
+
+# Define up to how many enemies the nearest ones are found by measuring all of them instead of looking in the spatial hash
+NEAREST_BRUTE_FORCE = 256
+
+# Define how many of the nearest enemies are heard in the heartbeat, and how far away (in tiles) it can be heard
+HEARTBEAT_THREATS = 3
+HEARTBEAT_RANGE = 10
+
+# Define if enemies hunt the player instead of wandering around the maze
+ENEMY_PURSUIT = False
+
+# Define how far along the paths (in tiles) hunting enemies can find the player, further away they wander
+PURSUIT_RANGE = 40
+
+# Define if enemies are planned by a separate process, games planned that way can't be replayed
+ENEMY_PLANNER = False
+
 # Define layer constants for sprite rendering order
 PLAYER_LAYER = 4
 BLOCK_LAYER = 2
@@ -22,9 +51,47 @@ TOP_LAYER = 5
 COLUMN_SIZE = 40
 ROW_SIZE = 32
 
-# Define constants for X and Y offsets to center the game screen
-X_OFFSET = (WIN_WIDTH/2) - (2.5 * TILE_SIZE)
-Y_OFFSET = (WIN_HEIGHT/2) - (2.5 * TILE_SIZE)
+# Define if the game is an endless descent through maze bands instead of one maze with an exit
+ENDLESS = False
+# Define the rows of a band, how many bands are kept around the player, the doors down to the next band and the enemies in a new band
+BAND_ROWS = 32
+ENDLESS_BANDS = 3
+ENDLESS_DOORS = 3
+ENDLESS_BAND_ENEMIES = 2
+
+# Define how many scaled spritesheet frames are kept in memory
+SPRITE_CACHE_SIZE = 256
+
+# Define the size of a pre-rendered tile chunk (in tiles) and how many chunks are kept
+CHUNK_SIZE = 4
+CHUNK_CACHE_SIZE = 24
+
+# Define if only the changed parts of the screen are redrawn while the view isn't scrolling
+DIRTY_RECTS = False
+
+# Define how many frames the profiler keeps
+PROFILE_HISTORY = 600
+
+# Define the size and frame rate the jumpscare video is decoded at, it is scaled up to the screen when shown
+JUMPSCARE_SIZE = (480, 270)
+JUMPSCARE_FPS = 15
+
+# Define the row the player has to pass below to escape the maze
+FINISH_ROW = 38
+
+# Define the tile used for empty space outside the map in level grids
+VOID_TILE = 255
+
+# Define a level file to play instead of generating mazes (None to generate them)
+LEVEL_FILE = None
+
+# Define the database finished runs are recorded in and how many runs the leaderboard shows
+RECORDS_FILE = "records.db"
+LEADERBOARD_SIZE = 5
+
+# Define the file the last game is recorded to, and how often a recording hashes the game state (in ticks)
+REPLAY_FILE = "last_run.replay"
+REPLAY_CHECK_INTERVAL = 60
 
 # Define color constants
 RED = (255, 0, 0)
@@ -0,0 +1,84 @@
+#Import relevant libraries
+import pygame
+from config import *
+
+# Define a function to format a time in seconds as minutes and seconds to a tenth
+def formatTime(seconds):
+    return f"{int(seconds // 60)}:{seconds % 60:04.1f}"
+
+# Define a class that renders text from cached per-character glyphs
+class GlyphCache:
+    # Initialize the cache with a font and a text color
+    def __init__(self, font, color):
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+
+    # Define a method to get the surface of a character, rendering it the first time
+    def glyph(self, character):
+        glyph = self.glyphs.get(character)
+        if glyph is None:
+            glyph = self.font.render(character, True, self.color)
+            self.glyphs[character] = glyph
+        return glyph
+
+    # Define a method to put the glyphs of a text together on one surface
+    def render(self, text):
+        glyphs = [self.glyph(character) for character in text]
+        image = pygame.Surface((sum(glyph.get_width() for glyph in glyphs), self.font.get_height()), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            image.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return image
+
+# Define a class for a piece of text on the HUD that only re-renders when it changes
+class HudText:
+    # Initialize the text with the glyphs to use and where it is anchored on the screen (e.g. topright=(x, y))
+    def __init__(self, glyphs, **anchor):
+        self.glyphs = glyphs
+        self.anchor = anchor
+        self.text = None
+        self.image = None
+        self.rect = None
+        # Where the text was when the HUD was last drawn, if it has changed since
+        self.previous_rect = None
+
+    # Define a method to change the text shown
+    def set(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        if self.previous_rect is None:
+            self.previous_rect = self.rect
+        self.image = self.glyphs.render(text)
+        self.rect = self.image.get_rect(**self.anchor)
+
+# Define a class that holds every element of the HUD and draws them on top of the game
+class Hud:
+    # Initialize the HUD with the font used for its text
+    def __init__(self, font):
+        self.glyphs = GlyphCache(font, WHITE)
+        self.elements = {}
+
+    # Define a method to add a text element by name
+    def addText(self, name, **anchor):
+        self.elements[name] = HudText(self.glyphs, **anchor)
+        return self.elements[name]
+
+    # Define a method to get where the HUD is now and where changed text was, so old glyphs get cleared as well
+    def dirtyRects(self):
+        rects = []
+        for element in self.elements.values():
+            if element.rect:
+                rects.append(element.rect)
+            if element.previous_rect:
+                rects.append(element.previous_rect)
+            element.previous_rect = None
+        return rects
+
+    # Define a method to draw every element that has text
+    def draw(self, screen):
+        for element in self.elements.values():
+            if element.image is not None:
+                screen.blit(element.image, element.rect)
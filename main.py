@@ -1,20 +1,48 @@
 #Import all relevant libraries
+import time
+#Note when the game was launched, to measure how fast the intro screen appears
+LAUNCH_TIME = time.perf_counter()
+import os
 import pygame
 from sprites import *
+from tiles import *
+from swarm import *
+from maze import *
+from simulation import *
+from profiler import *
+from hud import *
+from assets import *
+from audio import *
+from video import *
+from records import *
+from replay import *
+from planner import *
 from config import *
 import sys
-from moviepy.editor import*
-import time
+import struct
+import random
+import getpass
+import argparse
+import numpy as np
 
 #The class for the main loop of the game
 class Game:
     #Initialize the class
-    def __init__(self):
+    def __init__(self, headless=False, planner=ENEMY_PLANNER, endless=ENDLESS):
+        #Run without a window or sound, for simulations
+        self.headless = headless
+        #Descend through endless maze bands instead of escaping one maze
+        self.endless = endless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+
         pygame.init()
         #Set the screen size
         self.screen = pygame.display.set_mode((WIN_WIDTH, WIN_HEIGHT))
         #Set screen to fullscreen
-        pygame.display.toggle_fullscreen()
+        if not headless:
+            pygame.display.toggle_fullscreen()
         #Set a variable for the tickrate
         self.clock = pygame.time.Clock()
         #Variables to say if you're in the game or not 
@@ -22,10 +50,17 @@ class Game:
         #Variable to say if you've won
         self.win = False
 
-        self.records = "local_record.txt"
+        #Record finished runs for the leaderboard, simulated runs aren't recorded
+        self.records = NoRecords() if headless else RecordStore()
+        self.player_name = getpass.getuser()
         #Import a font
         self.font = pygame.font.Font("comici.ttf", 32)
 
+        #Set up the HUD with the timer in the top right corner
+        self.hud = Hud(self.font)
+        self.hud.addText("timer", topright=(WIN_WIDTH - 20, 30))
+        self.hud.addText("best", topright=(WIN_WIDTH - 20, 70))
+
         #Import graphics (Spritesheets, pictures)
         self.character_spritesheet = Spritesheet('img/character.png')
         self.terrain_spritesheet = Spritesheet('img/terrain.png')
@@ -33,176 +68,507 @@ class Game:
         self.floor_tile = Spritesheet('img/nedladdning.png')
         self.wall_tile = Spritesheet('img/Floor_Tile.png')
         self.intro_background = pygame.image.load('img/Front_Page.png')
-        self.win_background = pygame.image.load('img/escape.png')
+        self.win_background = pygame.image.load('img/Escape.png')
         self.go_background = pygame.image.load('img/jumpscare.png')
 
-        #Import audio files / Set the volume of the audio files
-        self.background_audio = pygame.mixer.Sound('audio/Creepy Dark Villain Theme _Lurking Evil_ Royalty Free Music Update.mp3')
-        self.background_audio.set_volume(0.1)
-        self.intro_audio = pygame.mixer.Sound('audio/ROYALTY FREE Elevator Music _ Waiting Music Royalty Free _ Muzak _ Royalty Free Jazz Music (1).mp3')
-        self.intro_audio.set_volume(0.3)
-        self.death_screen = pygame.mixer.Sound('audio/jumpscare_audio.mp3')
-        self.win_audio = pygame.mixer.Sound('audio/celtic_music.mp3') 
-        self.win_audio.set_volume(0.5)
-        self.enemy_step = pygame.mixer.Sound('audio/Fast Heartbeat Sound Effects _ Sound Effects For Editor soundeffects.mp3')
-        self.enemy_step.set_volume(0)
-
-        self.jumpscare = VideoFileClip('audio/jumpscare_video.mp4')
+        #Build the animations shared by every player and enemy
+        Player.loadAnimations(self.character_spritesheet)
+        EnemySwarm.loadAnimations(self.enemy_spritesheet)
+
+        #Keyboard input is scripted when simulating
+        self.script = None
+        self.tick = 0
+        self.rng = random.Random()
+        self.keys = KeyState()
+
+        #Load the sound effects and video in the background while the intro screen is shown
+        self.audio = AudioManager()
+        self.assets = AssetLoader()
+        if headless:
+            #Skip decoding the audio and video files nobody will hear or see
+            self.background_audio = self.intro_audio = self.death_screen = SilentSound()
+            self.win_audio = self.enemy_step = SilentSound()
+            self.jumpscare = None
+        else:
+            #Import audio files / Set the volume of the audio files
+            #The long music tracks are streamed from their files, only the short effects are kept in memory
+            self.intro_audio = self.audio.addMusic("intro", 'audio/ROYALTY FREE Elevator Music _ Waiting Music Royalty Free _ Muzak _ Royalty Free Jazz Music (1).mp3', 0.3)
+            self.background_audio = self.audio.addMusic("background", 'audio/Creepy Dark Villain Theme _Lurking Evil_ Royalty Free Music Update.mp3', 0.1)
+            self.win_audio = self.audio.addMusic("win", 'audio/celtic_music.mp3', 0.5)
+            self.assets.add("death_screen", self.audio.addEffect, "death_screen", 'audio/jumpscare_audio.mp3')
+            self.assets.add("enemy_step", self.audio.addEffect, "enemy_step", 'audio/Fast Heartbeat Sound Effects _ Sound Effects For Editor soundeffects.mp3', 0)
+
+            #Decode the jumpscare ahead of time so it shows the moment the player dies
+            self.assets.add("jumpscare", loadClip, 'audio/jumpscare_video.mp4')
+            self.assets.start()
+
+        #Record how long every part of a frame takes (F3 shows it, F4 saves it)
+        self.profiler = FrameProfiler()
+
+        #Plan where the enemies go on another process so it never costs frame time
+        self.planner = PlanWorker() if planner else None
+
+        #Keep the player between games, a new game moves it into place instead of building it again
+        self.player = None
+
+        #The personal best shown under the timer, only read again after an escape
+        self.personal_best = self.records.personalBest(self.player_name)
+        #Restart once per press of R, not every tick it is held
+        self.restart_held = False
+
+        #Prepare mazes on a background worker so starting a game doesn't stall
+        self.preloader = MazePreloader(self.prepareLevel)
+        self.restart_time = None
+        self.restart_latency = None
+        self.death_time = None
+        self.jumpscare_latency = None
 
 
     #Function to create the map
     def createTilemap(self):
-        #Go through every row and column in the tilemap
-        for i, row in enumerate(tilemap):
-            for j, column in enumerate(row):
-                #Set everything as ground
-                Ground(self, j, i)
-                #If the tile is 2 make it a blockedGround sprite
-                if column == 2:
-                    blockedGround(self, j, i)
-                #If the tile is 0 make it a unpassable block sprite
-                if column == 0:
-                    Block(self, j, i)
-                #If the tile is "P" spawn the player there
-                if column == "P":
-                    Player(self, j, i)
-                #If the tile is "E" place the enemy there
-                if column == "E":
-                    Enemy(self,j,i)
+        grid = self.level.grid
+
+        #Set up the distances to the player that hunting enemies follow
+        self.distance_field = DistanceField(grid)
+
+        #Collide with the walls of the maze
+        self.placeBlocks(grid)
+
+        #Spawn the player, the player of the last game is reused
+        if self.player is None:
+            self.player = Player(self, self.level.player[1], self.level.player[0])
+        else:
+            self.player.place(self.level.player[1], self.level.player[0])
+
+        #Place the enemies, the first at the enemy spawn and the rest on random paths away from the player
+        self.swarm = EnemySwarm(self, grid, self.distance_field.open, self.rng.randrange(2**32), self.planner)
+        self.swarm.add([self.level.enemy])
+        self.swarm.add(self.randomPaths(ENEMY_COUNT - 1))
+        self.swarm.loadPlanner()
+
+    #Function to check collisions against the wall tiles of a grid, read straight from the grid so no sprite is built per wall
+    def placeBlocks(self, grid):
+        self.blocks_grid = CollisionGrid(grid, 0)
+
+    #Function to move the world up a band when the player reaches the last band of an endless level, so it never grows
+    def descend(self):
+        rows = self.level.descend()
+        pixels = rows * TILE_SIZE
+        grid = self.level.grid
+
+        #Move the player, the camera and where everything was drawn from up with the maze
+        self.player.rect.y -= pixels
+        self.camera.rect.y -= pixels
+        self.previous = {sprite: (x, y - pixels) for sprite, (x, y) in self.previous.items()}
+
+        #Move the floor and walls, and the enemies that are still in the window
+        self.tile_layer.shift(grid, rows)
+        self.distance_field = DistanceField(grid)
+        self.placeBlocks(grid)
+        self.swarm.shift(grid, self.distance_field.open, pixels)
+
+        #Let a few enemies loose in the new band
+        top, bottom = self.level.bandRows(ENDLESS_BANDS - 1)
+        paths = np.argwhere(self.distance_field.open[top:bottom]) + (top, 0)
+        self.swarm.add(paths[self.rng.sample(range(len(paths)), min(ENDLESS_BAND_ENEMIES, len(paths)))])
+        self.swarm.loadPlanner()
+
+    #Function to pick a number of random path tiles at least a few tiles away from the player spawn, as (row, column)
+    def randomPaths(self, count, distance=5):
+        #Looking through a big maze for paths takes a while, skip it when no enemy is needed
+        if count <= 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        paths = np.argwhere(self.distance_field.open)
+        far = np.abs(paths - self.level.player).max(axis=1) >= distance
+        paths = paths[far]
+        return paths[self.rng.sample(range(len(paths)), min(count, len(paths)))]
 
     #Function to generate a randomized maze
-    def generateMaze(self, grid, current_cell):
-        row, col = current_cell
-        grid[row][col] = 1  # Mark the current cell as visited
-
-        # Possible directions to move
-        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
-        #Randomly shuffle the array
-        random.shuffle(directions)
-        for dr, dc in directions:
-            #Add a direction in directions to variables
-            new_row, new_col = row + dr, col + dc
-
-            if 0 <= new_row < ROW_SIZE and 0 <= new_col < COLUMN_SIZE and grid[new_row][new_col] == 0:
-                # If the neighbor is not visited, carve a path and recursively visit it
-                grid[row + dr // 2][col + dc // 2] = "1"
-                
-                self.generateMaze(grid, (new_row, new_col))
-            else:
-                self.maze_grid = grid
+    def generateMaze(self, seed=None):
+        #Carve a maze starting in the top left corner
+        return generateMaze(ROW_SIZE, COLUMN_SIZE, (0, 0), seed)
 
-    #Function to import the randomized maze to the tilemap
+    #Function to import the randomized maze into a copy of the tilemap
     def convertMaze(self, grid):
+        #Copy the tilemap so the maze currently played isn't changed
+        level = [list(row) for row in tilemap]
+
         #Set counting variables
         i = 0
         j = 0
 
-        while i < len(tilemap):
+        while i < len(level):
             #Sets the interval in where the maze should be placed in the tilemap
             if i < 6 or i >= 37:
                 i+=1
             else:
-                while j < len(tilemap[i]):
+                while j < len(level[i]):
                     #Sets the interval in where the maze should be placed in the tilemap
                     if j < 1 or j >= 41:
                         j += 1
                     else:
                         #Replace each tile of the tilemap with the corresponding tile in the grid
-                        tilemap[i][j] = grid[i - 6][j - 1]
+                        level[i][j] = int(grid[i - 6][j - 1])
                         j += 1
             i += 1
             j = 0
 
         #Set the tile below the start to always be a path, so you're never stuck
-        tilemap[6][1] = 1
+        level[6][1] = 1
 
         #Set the enemy spawn above the exit
-        tilemap[36][19] = "E"
-
+        level[36][19] = "E"
+
+        return level
+
+    #Function to prepare a level (the next maze if none is given), runs on the background worker
+    def prepareLevel(self, level=None, seed=None):
+        #Pick the seed of the game, everything random in it follows from the seed
+        if seed is None:
+            seed = random.randrange(2**32)
+
+        if level is None and self.endless:
+            #Start an endless descent, the bands below are generated as the player gets to them
+            level = EndlessLevel(seed)
+        elif level is None and LEVEL_FILE:
+            #Open the level file instead of generating a maze
+            level = Level.load(LEVEL_FILE)
+        elif level is None:
+            #Generate the maze and import it into the tilemap
+            level = Level.fromTilemap(self.convertMaze(self.generateMaze(seed)))
+        level.seed = seed
+
+        #Bake the floor and walls into chunks instead of one sprite per tile
+        floor_image = self.floor_tile.getSprite(0, 0, RENDER_SIZE, RENDER_SIZE, REGULAR_RATIO)
+        wall_image = self.wall_tile.getSprite(0, 0, RENDER_SIZE, RENDER_SIZE, REGULAR_RATIO)
+        tile_layer = TileLayer(level.grid, floor_image, wall_image)
+
+        #Bake the chunks around the player spawn so the first frame is ready
+        if not self.headless:
+            view = pygame.Rect(0, 0, WIN_WIDTH, WIN_HEIGHT)
+            view.center = (level.player[1] * TILE_SIZE + TILE_SIZE // 2, level.player[0] * TILE_SIZE + TILE_SIZE // 2)
+            tile_layer.bakeView(view)
+
+        return level, tile_layer
 
     #Function to start a new game
 
-    def new(self):
+    def new(self, level=None, seed=None):
         # a new game starts
-        pygame.mixer.stop() #Stop all previous music
+        self.audio.stop() #Stop all previous music
         self.playing = True #Variable thats says you're in the main game
         self.win = False
         self.start_time = time.perf_counter()
+        self.restart_time = self.start_time
+        #The player hasn't died in this game yet
+        self.death_time = None
+
+        self.createGroups()
+
+        #Wait for the audio and video if they are still loading
+        self.assets.install(self)
+
+        if level is None and seed is None:
+            #Swap in the maze prepared in the background
+            self.level, self.tile_layer = self.preloader.take()
+            #Start preparing the maze for the next restart, it is ready long before the game ends
+            self.preloader.start()
+        else:
+            #Play the level or seed that was given
+            self.level, self.tile_layer = self.prepareLevel(level, seed)
+
+        #Show the personal best under the timer, endless levels show the depth instead
+        if isinstance(self.level, EndlessLevel):
+            self.hud.elements["best"].set("Depth 0")
+        elif self.personal_best is not None:
+            self.hud.elements["best"].set("Best " + formatTime(self.personal_best))
+
+        #Enemies choose their paths with the game's own random numbers, and every tick is recorded, so the game can be replayed
+        self.rng = random.Random(self.level.seed)
+        self.recording = Recording(self.level.seed)
+
+        #Build the sprites of the maze
+        self.createTilemap()
+        self.camera.follow(self.player)
+        self.savePositions()
+
+        #Start background audio (loop it)
+        self.background_audio.play(loops = -1)
+        self.enemy_step.play(loops = -1)
 
+    #Function to set up empty sprite groups, collision grids and the camera
+    def createGroups(self):
         #Set up sprite groups
         self.all_sprites = pygame.sprite.LayeredUpdates()
         self.outside_sprites = pygame.sprite.LayeredUpdates()
-        self.blocks = pygame.sprite.LayeredUpdates()
-        self.enemies = pygame.sprite.LayeredUpdates()
         self.attacks = pygame.sprite.LayeredUpdates()
-        self.blocked_path = pygame.sprite.LayeredUpdates()
 
-        #Prepare the variable for the maze generation
-        self.maze_grid = [[0] * COLUMN_SIZE for _ in range(ROW_SIZE)]
+        #Set up the camera that scrolls the view over the maze
+        self.camera = Camera(WIN_WIDTH, WIN_HEIGHT)
 
-        #Call the creation of the maze
-        self.generateMaze(self.maze_grid, (0,0))
-        self.convertMaze(self.maze_grid)
-        self.createTilemap()
-
-        #Start background audio (loop it)
-        self.background_audio.play(loops = -1)
-        self.enemy_step.play(loops = -1)
+        #Nothing of this game has been drawn yet
+        self.drawn_view = None
+        self.drawn_rects = []
 
     #Check if you quit the game and end the game if you do
     def events(self):
         #game loop events
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
-            pygame.mixer.stop()
+        #Read the keyboard, or the scripted keys when simulating
+        if self.script is None:
+            self.keys = pygame.key.get_pressed()
+        else:
+            self.keys = KeyState(self.script(self.tick))
+        restart = self.keys[pygame.K_r]
+        if restart and not self.restart_held:
+            self.saveRecording()
+            self.audio.stop()
             for sprite in self.all_sprites:
                 sprite.kill()
             self.new()
+        self.restart_held = restart
             
         for event in pygame.event.get():
-           if event.type == pygame.QUIT:
+            if event.type == pygame.QUIT:
                 self.playing = False
                 self.running = False
+            if event.type == pygame.KEYDOWN:
+                #Show or hide the profiling overlay
+                if event.key == pygame.K_F3:
+                    self.profiler.visible = not self.profiler.visible
+                    #Draw the whole next frame so the overlay is drawn or covered everywhere
+                    self.drawn_view = None
+                #Save the recorded frames
+                if event.key == pygame.K_F4:
+                    self.profiler.dump(time.strftime("profile_%Y%m%d_%H%M%S.json"))
 
     def update(self):
         #game loop updates
-        self.all_sprites.update()
-        self.timerUpdate()
+        #Refresh the distances to the player if enemies are hunting, the planner keeps its own
+        if ENEMY_PURSUIT and not self.planner:
+            self.distance_field.update((self.player.rect.centery // TILE_SIZE, self.player.rect.centerx // TILE_SIZE))
+        #Move every enemy at once, then the player
+        with self.profiler.phase("enemies"):
+            self.swarm.update()
+        self.profiler.updateSprites(self.all_sprites)
+        #Bring in the next band of an endless level when the player gets to the last one
+        if self.level.reachedBottom(self.player.rect.centery // TILE_SIZE):
+            with self.profiler.phase("descend"):
+                self.descend()
+        self.camera.follow(self.player)
+        #Nothing is shown when simulating
+        if not self.headless:
+            with self.profiler.phase("timer"):
+                self.timerUpdate()
 
     def timerUpdate(self):
         time_elapsed = time.perf_counter() - self.start_time
-        self.time_array = [time_elapsed // 60, time_elapsed % 60]
-        self.timer = self.font.render(str(self.time_array[0]) + ':' + str(self.time_array[1]), True, WHITE)
-        self.timer_rect = self.timer.get_rect(center=(WIN_WIDTH - 50, 50))
-        self.screen.blit(self.timer, self.timer_rect)
-        pygame.display.update()
-
-    #Draw everything on the screen
-    def draw(self):
+        #Show minutes and seconds to a tenth, the text is only rendered again when that changes
+        self.hud.elements["timer"].set(formatTime(time_elapsed))
+        if isinstance(self.level, EndlessLevel):
+            self.hud.elements["best"].set(f"Depth {max(self.level.depth(self.player.rect.centery // TILE_SIZE), 0)}")
+
+    #Draw everything on the screen, alpha of the way from the last tick to the current one
+    def draw(self, alpha=1):
+        #Follow the player where it is drawn
+        self.camera.rect.center = self.interpolate(self.player, alpha).center
+
+        #Where every sprite is on the screen this frame
+        sprite_rects = [self.camera.apply(self.interpolate(sprite, alpha)) for sprite in self.all_sprites]
+        sprite_rects += self.swarm.screenRects(self.camera, alpha)
+
+        #Where the HUD is and where text that changed was, taken every frame so only this frame's changes are kept
+        hud_rects = self.hud.dirtyRects()
+
+        #If the view hasn't scrolled only the sprites and the HUD can have changed
+        if DIRTY_RECTS and self.camera.rect == self.drawn_view and not self.profiler.visible:
+            regions = sprite_rects + self.drawn_rects + hud_rects
+            #Redraw the scene clipped to each changed region and present only those
+            for region in regions:
+                self.screen.set_clip(region)
+                self.drawScene(alpha)
+            self.screen.set_clip(None)
+            pygame.display.update(regions)
+        else:
+            self.drawScene(alpha)
+            self.profiler.draw(self.screen)
+            #Show the finished frame
+            pygame.display.flip()
+
+        #Remember what was drawn for the next frame
+        self.drawn_view = self.camera.rect.copy()
+        self.drawn_rects = sprite_rects
+
+        #Measure how long it took from starting a game to its first frame
+        if self.restart_time is not None:
+            self.restart_latency = time.perf_counter() - self.restart_time
+            self.restart_time = None
+            self.profiler.measure("restart_ms", self.restart_latency * 1000)
+
+    #Draw the floor, walls, sprites and HUD
+    def drawScene(self, alpha=1):
         self.screen.fill(BLACK)
-        self.all_sprites.draw(self.screen)
-        self.clock.tick(FPS)
-
-    #The main loop of the game
+        #Draw the visible chunks of the floor and walls
+        self.tile_layer.draw(self.screen, self.camera)
+        #Draw the enemies, then every sprite shifted by the camera, in layer order
+        self.swarm.draw(self.screen, self.camera, alpha)
+        for sprite in self.all_sprites:
+            self.screen.blit(sprite.image, self.camera.apply(self.interpolate(sprite, alpha)))
+        #Draw the HUD on top
+        self.hud.draw(self.screen)
+
+    #Run the game logic as fast as possible for a number of ticks with scripted input
+    def simulate(self, ticks, script, restart=True):
+        self.script = script
+        games = 1
+        played = 0
+        start = time.perf_counter()
+
+        self.new()
+        for self.tick in range(ticks):
+            #Start a new game when the player dies or escapes, or stop
+            if not self.playing:
+                if not restart:
+                    break
+                self.new()
+                games += 1
+            self.frame(draw=False)
+            played += 1
+
+        seconds = time.perf_counter() - start
+        self.script = None
+        return {"ticks": played, "games": games, "seconds": seconds}
+
+    #Replay a recorded game as fast as possible, or watch it, and check that it played out the same
+    def replay(self, recording, render=False):
+        self.script = recording.script()
+        start = time.perf_counter()
+
+        self.new(seed=recording.seed)
+        for self.tick in range(len(recording.inputs)):
+            self.frame(draw=render)
+            if not self.playing:
+                break
+            #Show the replay at the speed it was played
+            if render:
+                self.clock.tick(TICK_RATE)
+
+        seconds = time.perf_counter() - start
+        self.script = None
+        return {"ticks": len(self.recording.inputs), "seconds": seconds,
+                "matches": self.recording.inputs == recording.inputs and self.recording.digest() == recording.final,
+                "diverged_at": self.recording.firstDifference(recording)}
+
+    #Get the state of the game that a replay has to match, as bytes
+    def state(self):
+        return struct.pack("<4i", self.playing, self.win, self.player.rect.x, self.player.rect.y) + self.swarm.state()
+
+    #Remember where everything is before a tick, so frames between ticks can be drawn in between
+    def savePositions(self):
+        self.previous = {sprite: sprite.rect.topleft for sprite in self.all_sprites}
+        self.swarm.savePositions()
+
+    #Get the rect of a sprite alpha of the way from where it was before the last tick to where it is
+    def interpolate(self, sprite, alpha):
+        previous = self.previous.get(sprite)
+        if previous is None or alpha == 1:
+            return sprite.rect
+        x, y = previous
+        return sprite.rect.move(round((x - sprite.rect.x) * (1 - alpha)), round((y - sprite.rect.y) * (1 - alpha)))
+
+    #Save the recording of the current game so it can be replayed
+    def saveRecording(self):
+        #Enemies follow plans that arrive whenever the planner is done, so those games play out differently every time
+        #Recordings don't say which mode was played, so endless games aren't saved either
+        if REPLAY_FILE and not self.headless and not self.planner and not isinstance(self.level, EndlessLevel):
+            self.recording.save(REPLAY_FILE)
+
+    #The main loop of the game, the logic runs at a fixed tick rate and frames are drawn as fast as the display allows
     def main(self):
         # game loop
+        tick_time = 1 / TICK_RATE
+        previous = time.perf_counter()
+        lag = 0
         while self.playing:
+            self.profiler.startFrame()
+            now = time.perf_counter()
+            lag += now - previous
+            previous = now
+
+            #Run as many ticks as the time that passed calls for, but no more than MAX_TICKS_PER_FRAME
+            ticks = 0
+            while lag >= tick_time and ticks < MAX_TICKS_PER_FRAME and self.playing:
+                self.step()
+                lag -= tick_time
+                ticks += 1
+
+            #Drop the time that couldn't be caught up with, so a slow computer slows the game down instead of falling further behind
+            if ticks == MAX_TICKS_PER_FRAME:
+                lag = min(lag, tick_time)
+
+            #Draw everything between the last two ticks, by how far the time is towards the next one
+            if self.playing:
+                with self.profiler.phase("draw"):
+                    self.draw(min(lag / tick_time, 1))
+            self.profiler.endFrame(len(self.all_sprites) + len(self.swarm))
+
+            #Limit the frames per second
+            self.clock.tick(RENDER_FPS)
+        self.saveRecording()
+
+    #Run one tick of the game logic
+    def step(self):
+        self.savePositions()
+        with self.profiler.phase("events"):
             self.events()
+        self.recording.record(self.keys)
+        with self.profiler.phase("update"):
             self.update()
-            self.draw()
+        self.recording.check(self.state())
+
+    #Run one tick of the game and draw it, recording how long every phase took
+    def frame(self, draw=True):
+        self.profiler.startFrame()
+        self.step()
+        #Nothing more is shown once the game has ended, the death or win screen takes over
+        if draw and self.playing:
+            with self.profiler.phase("draw"):
+                self.draw()
+        self.profiler.endFrame(len(self.all_sprites) + len(self.swarm))
+
+    #Start the jumpscare and show its first frame, measuring how long it took since the player died
+    def startJumpscare(self):
+        jumpscare = ClipPlayer(self.jumpscare, self.death_screen)
+        jumpscare.start()
+        jumpscare.draw(self.screen)
+        pygame.display.flip()
+        if self.death_time is not None:
+            self.jumpscare_latency = time.perf_counter() - self.death_time
+        return jumpscare
 
     #Function for the death screen of the game
     def gameOver(self):
 
         #Stop all music
-        pygame.mixer.stop()
+        self.audio.stop()
+
+        #Nothing to show if the window was closed instead of the player dying
+        if not self.running or self.death_time is None:
+            return
+
+        #Play the decoded jumpscare with its sound, one frame at a time
+        jumpscare = self.startJumpscare()
+        self.profiler.measure("jumpscare_ms", self.jumpscare_latency * 1000)
+        while self.running and not jumpscare.finished():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
 
-        self.jumpscare.preview()
+            self.clock.tick(FPS)
+            if jumpscare.draw(self.screen):
+                pygame.display.flip()
 
-        #Create text for the screen
-        text = self.font.render('You Died', True, WHITE)
-        #Create a hitbox for the text aswell as align it
-        text_rect = text.get_rect(center=(WIN_WIDTH/2, WIN_HEIGHT/2))
+        #Create text for the screen, centered on it
+        text = TextSprite(self.font, 'You Died', WHITE, (WIN_WIDTH/2, WIN_HEIGHT/2))
 
         #Create a restart button and a quit button
         restart_button = Button(10, WIN_HEIGHT-60, 120, 50, WHITE, BLACK, 'Restart', 32)
@@ -212,6 +578,9 @@ class Game:
         for sprite in self.all_sprites:
             sprite.kill()
 
+        #Show the text and buttons over the last frame, only changed parts are redrawn after that
+        menu = MenuScreen(self.screen, self.screen.copy(), [text, restart_button, quit_button])
+
 # Create a loop for handling events when the game is not playing
         while self.running and not self.playing:
             # Check for events in the event queue
@@ -236,23 +605,17 @@ class Game:
                 pygame.quit()
                 sys.exit
 
-            # Draw the text, quit button, and restart button on the screen
-            self.screen.blit(text, text_rect)
-            self.screen.blit(quit_button.image, quit_button.rect)
-            self.screen.blit(restart_button.image, restart_button.rect)
+            # Draw and present the parts of the screen that changed
+            menu.draw()
 
-            # Limit the frames per second and update the display
+            # Limit the frames per second
             self.clock.tick(FPS)
-            pygame.display.update()
 
     def winScreen(self):
         # Stop any playing audio and start playing the win audio in a loop
-        pygame.mixer.stop()
+        self.audio.stop()
         self.win_audio.play(loops=-1)
 
-        # Update the display
-        pygame.display.update()
-
         # Create restart and quit buttons for the win screen
         restart_button = Button(10, WIN_HEIGHT-60, 120, 50, WHITE, BLACK, 'Restart', 32)
         quit_button = Button(140, WIN_HEIGHT-60, 120, 50, WHITE, BLACK, 'QUIT', 32)
@@ -261,13 +624,16 @@ class Game:
         for sprite in self.all_sprites:
             sprite.kill()
 
-        # Draw the win background and buttons on the screen
-        self.screen.blit(self.win_background, (0, 0))
-        self.screen.blit(restart_button.image, restart_button.rect)
-        self.screen.blit(quit_button.image, quit_button.rect)
+        # Create the leaderboard, once the run that was just finished has been written
+        self.records.flush()
+        # The run may be a new personal best
+        self.personal_best = self.records.personalBest(self.player_name)
+        leaderboard = [TextSprite(self.font, 'Fastest escapes', WHITE, (WIN_WIDTH/2, WIN_HEIGHT/2))]
+        for place, (player, seconds) in enumerate(self.records.top(), 1):
+            leaderboard.append(TextSprite(self.font, f'{place}. {player}  {formatTime(seconds)}', WHITE, (WIN_WIDTH/2, WIN_HEIGHT/2 + place * 40)))
 
-        # Update the display
-        pygame.display.update()
+        # Show the win background, leaderboard and buttons, only changed parts are redrawn after that
+        menu = MenuScreen(self.screen, self.win_background, leaderboard + [restart_button, quit_button])
 
         # Create a loop for handling events when the game is not playing
         while self.running and not self.playing:
@@ -293,17 +659,37 @@ class Game:
                 pygame.quit()
                 sys.exit()
 
-    
-    def introScreen(self):
-        # Set the intro flag to True
-        intro = True
+            # Draw and present the parts of the screen that changed
+            menu.draw()
+
+            # Limit the frames per second
+            self.clock.tick(FPS)
 
+    
+    #Define a method to show the first frame of the intro screen, how long the game took to get here is measured
+    def introMenu(self):
         # Start playing the intro audio in a loop
         self.intro_audio.play(loops=-1)
 
-        # Create play and quit buttons for the intro screen
+        # Prepare the first maze while the intro screen is shown
+        self.preloader.start()
+
+        # Create play and quit buttons for the intro screen, and a bar showing how much has loaded
         play_button = Button(WIN_WIDTH/2 - 50, WIN_HEIGHT/2+30, 100, 50, WHITE, BLACK, 'PLAY', 32)
         quit_button = Button(WIN_WIDTH/2 - 50, WIN_HEIGHT/2 + 90, 100, 50, WHITE, BLACK, 'QUIT', 32)
+        loading_bar = ProgressBar(WIN_WIDTH/2 - 50, WIN_HEIGHT/2 + 50, 100, 10, WHITE, BLACK)
+
+        # Show the intro background and the loading bar, only changed parts are redrawn after that
+        menu = MenuScreen(self.screen, self.intro_background, [loading_bar, quit_button])
+        self.profiler.measure("launch_ms", (time.perf_counter() - LAUNCH_TIME) * 1000)
+        return menu, play_button, quit_button, loading_bar
+
+    def introScreen(self):
+        # Set the intro flag to True
+        intro = True
+
+        menu, play_button, quit_button, loading_bar = self.introMenu()
+        loading = True
 
         # Enter a loop for handling events during the intro screen
         while intro:
@@ -318,8 +704,17 @@ class Game:
             mouse_pos = pygame.mouse.get_pos()
             mouse_pressed = pygame.mouse.get_pressed()
 
+            # Swap the loading bar for the play button once everything has loaded
+            loading_bar.set(self.assets.progress())
+            if loading and self.assets.done():
+                self.assets.install(self)
+                loading_bar.kill()
+                menu.group.add(play_button)
+                loading = False
+                self.profiler.measure("resident_audio_mb", self.audio.residentBytes() / 2**20)
+
             # Check if the play button is pressed
-            if play_button.isPressed(mouse_pos, mouse_pressed):
+            if not loading and play_button.isPressed(mouse_pos, mouse_pressed):
                 intro = False
 
             # Check if the quit button is pressed
@@ -328,41 +723,75 @@ class Game:
                 pygame.quit()
                 sys.exit()
 
-            # Draw the intro background and buttons on the screen
-            self.screen.blit(self.intro_background, (0, 0))
-            self.screen.blit(play_button.image, play_button.rect)
-            self.screen.blit(quit_button.image, quit_button.rect)
+            # Draw and present the parts of the screen that changed
+            menu.draw()
 
             # Control the frame rate
             self.clock.tick(FPS)
 
-            # Update the display
-            pygame.display.update()
-
-
-
-# Create a variable for the game class
-g = Game()
-
-# Display the introduction screen
-g.introScreen()
-
-# Start a new game
-g.new()
-
-# Enter the main game loop while the game is running
-while g.running:
-    # Execute the main game logic
-    g.main()
 
-    # Check if the player has won
-    if g.win:
-        # Display the win screen
-        g.winScreen()
-    else:
-        # Display the game over screen
-        g.gameOver()
 
-# Quit the pygame module and exit the system
-pygame.quit()
-sys.exit()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="The Cryptwalker")
+    parser.add_argument("--headless", type=int, metavar="TICKS",
+                        help="simulate this many ticks without a window, walking at random")
+    parser.add_argument("--seed", type=int, help="seed for the random walk")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded game as fast as possible and check it")
+    parser.add_argument("--render", action="store_true", help="show the replay in the window at normal speed")
+    parser.add_argument("--planner", action="store_true", default=ENEMY_PLANNER,
+                        help="plan where the enemies go in a separate process")
+    parser.add_argument("--endless", action="store_true", default=ENDLESS,
+                        help="descend through an endless maze instead of escaping one maze")
+    args = parser.parse_args()
+
+    if args.replay:
+        # Play the recorded game again and report if it turned out the same
+        recording = Recording.load(args.replay)
+        g = Game(headless=not args.render, planner=False)
+        result = g.replay(recording, render=args.render)
+        print(f"{result['ticks']} ticks in {result['seconds']:.2f}s "
+              f"({result['ticks'] / result['seconds']:.0f} ticks/s), seed {recording.seed}")
+        if result["matches"]:
+            print("Replay matches the recording")
+        else:
+            print(f"Replay differs from the recording (it differs by tick {result['diverged_at']})")
+        pygame.quit()
+        sys.exit(0 if result["matches"] else 1)
+
+    if args.headless:
+        # Soak-test the game logic and report how fast it ran
+        g = Game(headless=True, planner=False, endless=args.endless)
+        result = g.simulate(args.headless, randomWalk(args.seed))
+        print(f"{result['ticks']} ticks in {result['seconds']:.2f}s "
+              f"({result['ticks'] / result['seconds']:.0f} ticks/s), {result['games']} games")
+        pygame.quit()
+        sys.exit()
+
+    # Create a variable for the game class
+    g = Game(planner=args.planner, endless=args.endless)
+
+    # Display the introduction screen
+    g.introScreen()
+
+    # Start a new game
+    g.new()
+
+    # Enter the main game loop while the game is running
+    while g.running:
+        # Execute the main game logic
+        g.main()
+
+        # Check if the player has won
+        if g.win:
+            # Display the win screen
+            g.winScreen()
+        else:
+            # Display the game over screen
+            g.gameOver()
+
+    # Write the remaining runs, then quit the pygame module and exit the system
+    g.records.close()
+    if g.planner:
+        g.planner.close()
+    pygame.quit()
+    sys.exit()
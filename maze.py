@@ -0,0 +1,223 @@
+#Import relevant libraries
+import itertools
+import struct
+import numpy as np
+from config import *
+from concurrent.futures import ThreadPoolExecutor
+
+# Define a function to generate a randomized maze with an iterative depth-first search
+def generateMaze(rows, columns, start=(0, 0), seed=None):
+    # The maze is searched over the cells on even rows and columns, the tiles between them become walls or paths
+    cell_rows = (rows + 1) // 2
+    cell_columns = (columns + 1) // 2
+
+    # Visited cells, with a border of visited cells around them so no bounds checks are needed
+    width = cell_columns + 2
+    visited = bytearray(b"\x01" * width) + (b"\x01" + bytearray(cell_columns) + b"\x01") * cell_rows + bytearray(b"\x01" * width)
+
+    # Direction each cell was entered from its parent (0 for the start cell), this doubles as the search stack
+    entered = bytearray(len(visited))
+
+    # Every order the four directions can be tried in, with the direction code stored in entered
+    moves = (-1, 1, -width, width)
+    orders = [tuple((moves[i], i + 1) for i in order) for order in itertools.permutations(range(4))]
+
+    # Pick an order for every step up front (every cell is entered once and left once)
+    choices = np.random.default_rng(seed).integers(0, len(orders), 2 * cell_rows * cell_columns).tolist()
+    step = 0
+
+    # Start the search in the start cell
+    current = (start[0] // 2 + 1) * width + start[1] // 2 + 1
+    visited[current] = 1
+
+    while True:
+        # Move to the first unvisited neighbour in a random order
+        for direction, code in orders[choices[step]]:
+            if not visited[current + direction]:
+                current += direction
+                visited[current] = 1
+                entered[current] = code
+                break
+        else:
+            # Go back to the parent when every neighbour has been visited, and stop back at the start
+            code = entered[current]
+            if not code:
+                break
+            current -= moves[code - 1]
+        step += 1
+
+    # Strip the border from the search results
+    entered = np.frombuffer(entered, dtype=np.uint8).reshape(cell_rows + 2, width)[1:-1, 1:-1]
+
+    # Carve the start cell, every visited cell and the tile between each cell and its parent
+    grid = np.zeros((rows, columns), dtype=np.uint8)
+    grid[start[0], start[1]] = 1
+    grid[0::2, 0::2][entered > 0] = 1
+    cell_row, cell_column = np.nonzero(entered == 1)
+    grid[2 * cell_row, 2 * cell_column + 1] = 1
+    cell_row, cell_column = np.nonzero(entered == 2)
+    grid[2 * cell_row, 2 * cell_column - 1] = 1
+    cell_row, cell_column = np.nonzero(entered == 3)
+    grid[2 * cell_row + 1, 2 * cell_column] = 1
+    cell_row, cell_column = np.nonzero(entered == 4)
+    grid[2 * cell_row - 1, 2 * cell_column] = 1
+    return grid
+
+# Define a function to generate one band of an endless maze, with walls on both sides and doors in its bottom wall
+def generateBand(seed, index, rows=BAND_ROWS, columns=COLUMN_SIZE):
+    # Every band gets its own random numbers from the seed of the game and its place, so it comes out the same whenever it is generated
+    rng = np.random.default_rng([seed, index])
+    band = np.zeros((rows, columns + 2), dtype=np.uint8)
+    band[:, 1:-1] = generateMaze(rows, columns, (0, 0), int(rng.integers(2**32)))
+
+    # Open doors in the bottom wall below cells of the maze, the top row of the next band is a path below every cell
+    cells = np.arange(0, columns, 2) + 1
+    band[-1, rng.choice(cells, min(ENDLESS_DOORS, len(cells)), replace=False)] = 1
+    return band
+
+# Define a class that prepares the next maze on a background thread
+class MazePreloader:
+    # Initialize the preloader with the function that prepares a maze
+    def __init__(self, prepare):
+        self.prepare = prepare
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # The maze being prepared, or None if nothing has been started
+        self.future = None
+
+    # Define a method to start preparing a maze if one isn't already prepared
+    def start(self):
+        if self.future is None:
+            self.future = self.executor.submit(self.prepare)
+
+    # Define a method to get the prepared maze, waiting for it if it isn't done yet
+    def take(self):
+        self.start()
+        future = self.future
+        self.future = None
+        return future.result()
+
+# Define a class for a level: a grid of tiles with the spawns and the finish line
+class Level:
+    # Layout of the header of a level file: magic, version, size, player spawn, enemy spawn, finish row
+    header = struct.Struct("<4sHIIiiiii")
+    magic = b"CRYP"
+    version = 1
+    # Finish row stored for levels without a finish line
+    no_finish = -1
+
+    # Initialize the level with its tile grid and metadata
+    def __init__(self, grid, player, enemy, finish_row=FINISH_ROW):
+        # Grid of tiles (0 wall, 1 path, 2 blocked ground, VOID_TILE nothing), indexed [row, column]
+        self.grid = grid
+        # Spawns as (row, column)
+        self.player = player
+        self.enemy = enemy
+        self.finish_row = finish_row
+        # Seed of the game played on the level, set by the game when it is prepared
+        self.seed = None
+
+    # Define a method to create a level from a tilemap with "P" and "E" spawns
+    @classmethod
+    def fromTilemap(cls, tilemap):
+        # Rows of the tilemap can have different lengths, the missing tiles are left empty
+        grid = np.full((len(tilemap), max(len(row) for row in tilemap)), VOID_TILE, dtype=np.uint8)
+        player = enemy = None
+        for i, row in enumerate(tilemap):
+            for j, column in enumerate(row):
+                # Spawns are stored separately and are paths in the grid
+                if column == "P":
+                    player = (i, j)
+                    column = 1
+                elif column == "E":
+                    enemy = (i, j)
+                    column = 1
+                grid[i, j] = column
+        if player is None:
+            raise ValueError("The tilemap has no player spawn (P)")
+        if enemy is None:
+            raise ValueError("The tilemap has no enemy spawn (E)")
+        return cls(grid, player, enemy)
+
+    # Define a method to check if a row of the grid is in the last band of an endless level, other levels never descend
+    def reachedBottom(self, row):
+        return False
+
+    # Define a method to save the level to a file
+    def save(self, path):
+        if self.player is None or self.enemy is None:
+            raise ValueError("A level needs a player and an enemy spawn to be saved")
+        rows, columns = self.grid.shape
+        finish_row = self.no_finish if self.finish_row is None else self.finish_row
+        with open(path, "wb") as file:
+            file.write(self.header.pack(self.magic, self.version, rows, columns,
+                                        *self.player, *self.enemy, finish_row))
+            np.ascontiguousarray(self.grid, dtype=np.uint8).tofile(file)
+
+    # Define a method to open a level file, the tiles are memory-mapped and only read when used
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read(cls.header.size)
+        if len(data) < cls.header.size:
+            raise ValueError(f"{path} is too short to be a level file")
+
+        magic, version, rows, columns, player_row, player_column, enemy_row, enemy_column, finish_row = cls.header.unpack(data)
+        if magic != cls.magic or version != cls.version:
+            raise ValueError(f"{path} is not a version {cls.version} level file")
+
+        grid = np.memmap(path, dtype=np.uint8, mode="r", offset=cls.header.size, shape=(rows, columns))
+        if finish_row == cls.no_finish:
+            finish_row = None
+        return cls(grid, (player_row, player_column), (enemy_row, enemy_column), finish_row)
+
+# Define a class for an endless level: a window of maze bands that moves down as the player descends
+class EndlessLevel(Level):
+    # Bands are generated ahead of the player on one background thread shared by every endless level
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    def __init__(self, seed):
+        self.maze_seed = seed
+        # Index of the top band in the window, the bands above it have been dropped
+        self.first_band = 0
+
+        # A solid wall above the first band keeps the player inside the window
+        bands = [generateBand(seed, index) for index in range(ENDLESS_BANDS)]
+        ceiling = np.zeros((1, bands[0].shape[1]), dtype=np.uint8)
+        grid = np.concatenate([ceiling] + bands)
+
+        # The first enemy waits on a random path of the second band
+        top, bottom = self.bandRows(1)
+        paths = np.argwhere(grid[top:bottom] == 1) + (top, 0)
+        enemy = tuple(paths[np.random.default_rng(seed).integers(len(paths))].tolist())
+
+        # There is no finish line, the game goes on until the player is caught
+        Level.__init__(self, grid, (1, 1), enemy, None)
+
+        # Start generating the band below the window
+        self.next_band = self.executor.submit(generateBand, seed, ENDLESS_BANDS)
+
+    # Define a method to get the first row and the row after the last of a band by its place in the window
+    def bandRows(self, place):
+        top = 1 + place * BAND_ROWS
+        return top, top + BAND_ROWS
+
+    # Define a method to check if a row of the grid is in the last band of the window
+    def reachedBottom(self, row):
+        return row >= self.bandRows(ENDLESS_BANDS - 1)[0]
+
+    # Define a method to get how many rows below the start of the maze a row of the grid is
+    def depth(self, row):
+        return self.first_band * BAND_ROWS + row - 1
+
+    # Define a method to drop the top band and add the next one below it, returns how many rows the window moved down
+    def descend(self):
+        # The next band is normally done long before it is needed, it is only waited for if the player got there first
+        band = self.next_band.result()
+        self.first_band += 1
+        self.next_band = self.executor.submit(generateBand, self.maze_seed, self.first_band + ENDLESS_BANDS)
+
+        # The bottom wall of the dropped band becomes the ceiling, with its doors closed
+        grid = np.concatenate((self.grid[BAND_ROWS:], band))
+        grid[0] = 0
+        self.grid = grid
+        return BAND_ROWS
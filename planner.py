@@ -0,0 +1,178 @@
+#Import relevant libraries
+import multiprocessing
+import queue
+import numpy as np
+from multiprocessing import shared_memory
+from swarm import EnemySwarm
+from tiles import DistanceField
+from config import *
+
+# Define a class for a block of shared memory with the maze, the enemies of a tick and the plan the planner made for them
+class SharedPlan:
+    # Slots of the header: snapshots sent, enemies in the snapshot, player row and column, snapshot the plan was made from
+    SENT, COUNT, PLAYER_ROW, PLAYER_COLUMN, PLANNED = range(5)
+
+    # Initialize the arrays in a new block, or in the block with a name made by the other process
+    def __init__(self, shape, capacity, name=None):
+        rows, columns = shape
+        size = 5 * 8 + 2 * 3 * capacity * 8 + rows * columns
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.capacity = capacity
+
+        buffer = self.memory.buf
+        self.header = np.ndarray(5, dtype=np.int64, buffer=buffer)
+        offset = self.header.nbytes
+        # x, y and direction of every enemy, written by the game every tick
+        self.snapshot = np.ndarray((3, capacity), dtype=np.int64, buffer=buffer, offset=offset)
+        offset += self.snapshot.nbytes
+        # Row and column of the tile every enemy lines up with next and the way to go there, written by the planner
+        self.plan = np.ndarray((3, capacity), dtype=np.int64, buffer=buffer, offset=offset)
+        offset += self.plan.nbytes
+        # The maze, written once when a game starts
+        self.grid = np.ndarray(shape, dtype=np.uint8, buffer=buffer, offset=offset)
+
+    # Define a method to stop using the block, numpy arrays must let go of it first
+    def close(self):
+        del self.header, self.snapshot, self.plan, self.grid
+        self.memory.close()
+
+# Define a class that plans where the enemies go in a separate process, the game never waits for it
+class PlanWorker:
+    def __init__(self):
+        # Start a fresh process, forking a process with a window and running threads isn't safe
+        context = multiprocessing.get_context("spawn")
+        # Guards the shared memory while one side copies it, the game only takes it when it is free
+        self.lock = context.Lock()
+        # Set when a new snapshot is waiting for the planner
+        self.ready = context.Event()
+        # Names of the shared memory of every new game, None stops the planner
+        self.levels = context.Queue()
+        self.process = context.Process(target=work, args=(self.levels, self.lock, self.ready), daemon=True)
+        self.process.start()
+
+        self.shared = None
+        self.sent = 0
+        # The last plan read back and the snapshot it was made from
+        self.latest = None
+        self.planned = 0
+
+    # Define a method to share the maze of a game with room for a number of enemies
+    def load(self, grid, capacity, seed):
+        old = self.shared
+        self.shared = SharedPlan(grid.shape, capacity)
+        self.shared.grid[:] = grid
+        self.shared.plan[:] = -1
+        self.sent = 0
+        self.latest = None
+        self.planned = 0
+        self.levels.put((self.shared.name, grid.shape, capacity, seed))
+
+        # The planner may still have the old block open, it stays readable until it lets go of it
+        if old:
+            old.memory.unlink()
+            old.close()
+
+    # Define a method to hand the planner the enemies and player of a tick, skipped if the planner is busy copying
+    def send(self, x, y, direction, player):
+        if not self.lock.acquire(False):
+            return
+        try:
+            shared = self.shared
+            count = min(len(x), shared.capacity)
+            shared.snapshot[0, :count] = x[:count]
+            shared.snapshot[1, :count] = y[:count]
+            shared.snapshot[2, :count] = direction[:count]
+            shared.header[SharedPlan.COUNT] = count
+            shared.header[SharedPlan.PLAYER_ROW], shared.header[SharedPlan.PLAYER_COLUMN] = player
+            self.sent += 1
+            shared.header[SharedPlan.SENT] = self.sent
+        finally:
+            self.lock.release()
+        self.ready.set()
+
+    # Define a method to get the newest plan, or the last one read if the planner is busy writing
+    def plan(self):
+        if self.lock.acquire(False):
+            try:
+                planned = int(self.shared.header[SharedPlan.PLANNED])
+                if planned != self.planned:
+                    self.latest = self.shared.plan.copy()
+                    self.planned = planned
+            finally:
+                self.lock.release()
+        return self.latest
+
+    # Define a method to stop the planner and remove the shared memory
+    def close(self):
+        self.levels.put(None)
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        if self.shared:
+            self.shared.memory.unlink()
+            self.shared.close()
+            self.shared = None
+
+# Define the function the planner process runs: plan every snapshot of the enemies it is given
+def work(levels, lock, ready):
+    shared = field = rng = None
+    planned = 0
+    parent = multiprocessing.parent_process()
+    while parent.is_alive():
+        # Wait for a snapshot, but check every now and then that the game is still running
+        ready.wait(0.1)
+        ready.clear()
+
+        # Switch to the newest game, skipping games that were already over before they were read
+        while True:
+            try:
+                level = levels.get_nowait()
+            except queue.Empty:
+                break
+            if level is None:
+                if shared:
+                    shared.close()
+                return
+            name, shape, capacity, seed = level
+            try:
+                new = SharedPlan(shape, capacity, name)
+            except FileNotFoundError:
+                continue
+            if shared:
+                shared.close()
+            shared = new
+            field = DistanceField(np.array(shared.grid))
+            rng = np.random.default_rng(seed)
+            planned = 0
+        if shared is None:
+            continue
+
+        # Copy the snapshot out so the game can write the next one
+        with lock:
+            sent = int(shared.header[SharedPlan.SENT])
+            count = int(shared.header[SharedPlan.COUNT])
+            player = (int(shared.header[SharedPlan.PLAYER_ROW]), int(shared.header[SharedPlan.PLAYER_COLUMN]))
+            x, y, direction = shared.snapshot[:, :count].copy()
+        if sent == planned:
+            continue
+
+        # Decide the way every enemy goes at the next tile it lines up with
+        rows, columns = EnemySwarm.targets(x, y, direction)
+        distances = None
+        if ENEMY_PURSUIT:
+            field.update(player)
+            distances = field.distances
+        choice = EnemySwarm.planDirections(field.open, distances, rows, columns, direction, rng)
+
+        with lock:
+            shared.plan[0, :count] = rows
+            shared.plan[1, :count] = columns
+            shared.plan[2, :count] = choice
+            shared.header[SharedPlan.PLANNED] = sent
+        planned = sent
+    if shared:
+        shared.close()
@@ -0,0 +1,111 @@
+#Import relevant libraries
+import json
+import time
+import pygame
+from config import *
+from tiles import CollisionGrid
+from collections import deque
+from contextlib import contextmanager
+
+# Define a class that records how long every part of a frame takes
+class FrameProfiler:
+    # Initialize the profiler with the number of frames to keep
+    def __init__(self, history=PROFILE_HISTORY):
+        # Recorded frames, the oldest are dropped when the buffer is full
+        self.frames = deque(maxlen=history)
+        # Measurements taken once in a while, like how long a restart took, the oldest are dropped the same way
+        self.measurements = deque(maxlen=history)
+        # Variable to say if the overlay is shown
+        self.visible = False
+        self.font = None
+        self.startFrame()
+
+    # Define a method to start recording a new frame
+    def startFrame(self):
+        self.current = {"phases": {}, "classes": {}}
+        self.frame_start = time.perf_counter()
+
+    # Define a method to time a phase of the frame, used as a with-statement
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = self.current["phases"]
+            phases[name] = phases.get(name, 0) + (time.perf_counter() - start) * 1000
+
+    # Define a method to update every sprite and time the updates per sprite class
+    def updateSprites(self, sprites):
+        classes = self.current["classes"]
+        for sprite in sprites:
+            start = time.perf_counter()
+            sprite.update()
+            name = type(sprite).__name__
+            classes[name] = classes.get(name, 0) + (time.perf_counter() - start) * 1000
+
+    # Define a method to finish the frame and store it in the history
+    def endFrame(self, sprites):
+        self.current["total"] = (time.perf_counter() - self.frame_start) * 1000
+        self.current["sprites"] = sprites
+
+        # Take the collision checks counted during the frame
+        self.current["collision_checks"] = CollisionGrid.checks
+        CollisionGrid.checks = 0
+
+        self.frames.append(self.current)
+        self.startFrame()
+
+    # Define a method to store a measurement with the time it was taken
+    def measure(self, name, value):
+        self.measurements.append({"name": name, "value": value, "time": time.time()})
+
+    # Define a method to get the latest value of a measurement, or None if it hasn't been taken
+    def latest(self, name):
+        for measurement in reversed(self.measurements):
+            if measurement["name"] == name:
+                return measurement["value"]
+        return None
+
+    # Define a method to get a percentile of the total frame time in milliseconds
+    def percentile(self, fraction):
+        if not self.frames:
+            return 0
+        totals = sorted(frame["total"] for frame in self.frames)
+        return totals[round(fraction * (len(totals) - 1))]
+
+    # Define a method to write the recorded frames to a file
+    def dump(self, path):
+        with open(path, "w") as file:
+            json.dump({"frames": list(self.frames), "measurements": list(self.measurements)}, file)
+
+    # Define a method to draw the overlay with the latest statistics
+    def draw(self, screen):
+        if not self.visible or not self.frames:
+            return
+        if self.font is None:
+            self.font = pygame.font.Font("comici.ttf", 18)
+
+        # Average the phases and classes over the last second of frames
+        recent = list(self.frames)[-RENDER_FPS:]
+        def average(key):
+            names = sorted({name for frame in recent for name in frame[key]})
+            return "  ".join(f"{name} {sum(frame[key].get(name, 0) for frame in recent) / len(recent):.2f}" for name in names)
+
+        last = self.frames[-1]
+        lines = [f"frame p50 {self.percentile(0.5):.1f} ms  p99 {self.percentile(0.99):.1f} ms",
+                 f"phases (ms): {average('phases')}",
+                 f"sprites (ms): {average('classes')}",
+                 f"sprites {last['sprites']}  collision checks {last['collision_checks']}"]
+        # The latest of every measurement
+        latest = {measurement["name"]: measurement["value"] for measurement in self.measurements}
+        if latest:
+            lines.append("  ".join(f"{name} {value:.1f}" for name, value in latest.items()))
+
+        # Draw the lines on a dark background in the top left corner
+        texts = [self.font.render(line, True, WHITE) for line in lines]
+        background = pygame.Surface((max(text.get_width() for text in texts) + 20, len(texts) * 24 + 10))
+        background.set_alpha(180)
+        screen.blit(background, (0, 0))
+        for i, text in enumerate(texts):
+            screen.blit(text, (10, 5 + i * 24))
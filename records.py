@@ -0,0 +1,88 @@
+#Import relevant libraries
+import queue
+import sqlite3
+import threading
+import time
+from config import *
+
+# Define a class that stores finished runs in an SQLite database, writing them on a background thread
+class RecordStore:
+    def __init__(self, path=RECORDS_FILE):
+        self.path = path
+
+        # Create the table and the indexes the leaderboard queries use
+        self.connection = self.connect()
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                player TEXT NOT NULL,
+                seconds REAL NOT NULL,
+                finished REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS runs_by_time ON runs (seconds);
+            CREATE INDEX IF NOT EXISTS runs_by_player ON runs (player, seconds);
+        """)
+
+        # Runs waiting to be written, None stops the writer
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write, daemon=True)
+        self.writer.start()
+
+    # Define a method to open a connection, in WAL mode so reading never waits for the writer
+    def connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # Define a method to record a finished run without waiting for it to be written
+    def add(self, player, seconds):
+        self.pending.put((player, seconds, time.time()))
+
+    # Define a method that writes the runs, runs on the writer thread
+    def write(self):
+        connection = None
+        running = True
+        while running:
+            # Wait for a run, then write every run that is waiting in one transaction
+            runs = [self.pending.get()]
+            while True:
+                try:
+                    runs.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            taken = len(runs)
+            if None in runs:
+                running = False
+                runs = [run for run in runs if run is not None]
+            try:
+                if connection is None:
+                    connection = self.connect()
+                with connection:
+                    connection.executemany("INSERT INTO runs (player, seconds, finished) VALUES (?, ?, ?)", runs)
+            except sqlite3.Error as error:
+                # A locked, damaged or full database loses these runs, but the game must not wait on them forever
+                print(f"Could not record {len(runs)} run(s) in {self.path}: {error}")
+            finally:
+                for _ in range(taken):
+                    self.pending.task_done()
+        if connection is not None:
+            connection.close()
+
+    # Define a method to wait until every recorded run has been written
+    def flush(self):
+        self.pending.join()
+
+    # Define a method that returns the fastest runs as (player, seconds)
+    def top(self, count=LEADERBOARD_SIZE):
+        return self.connection.execute("SELECT player, seconds FROM runs ORDER BY seconds LIMIT ?", (count,)).fetchall()
+
+    # Define a method that returns the fastest run of a player in seconds, or None if they haven't escaped yet
+    def personalBest(self, player):
+        return self.connection.execute("SELECT MIN(seconds) FROM runs WHERE player = ?", (player,)).fetchone()[0]
+
+    # Define a method to write the remaining runs and close the database
+    def close(self):
+        self.pending.put(None)
+        self.writer.join()
+        self.connection.close()
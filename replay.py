@@ -0,0 +1,95 @@
+#Import relevant libraries
+import hashlib
+import struct
+import zlib
+import pygame
+from config import *
+
+# The keys that steer the player, one bit each in the recorded input of a tick
+KEYS = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+
+# Define a function to pack the held steering keys into one byte
+def encodeKeys(keys):
+    mask = 0
+    for bit, key in enumerate(KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+# Define a function to unpack a byte back into the held steering keys
+def decodeKeys(mask):
+    return tuple(key for bit, key in enumerate(KEYS) if mask & 1 << bit)
+
+# Define a class for the recording of one game: its seed, the input of every tick and hashes of the game state
+class Recording:
+    # Layout of the header of a replay file: magic, version, seed, ticks, compressed input size, checkpoints
+    header = struct.Struct("<4sHIIII")
+    magic = b"CRRP"
+    version = 2
+    digest_size = 16
+
+    def __init__(self, seed, inputs=b"", checkpoints=(), final=None):
+        self.seed = seed
+        self.inputs = bytearray(inputs)
+        # Hashes of the game state every REPLAY_CHECK_INTERVAL ticks, to find where a replay went wrong
+        self.checkpoints = list(checkpoints)
+        # Hash of the game state after the last tick, as saved
+        self.final = final
+        self.state = hashlib.blake2b(digest_size=self.digest_size)
+
+    # Define a method to record the keys held in a tick
+    def record(self, keys):
+        self.inputs.append(encodeKeys(keys))
+
+    # Define a method to add the state of the game after a tick to the running hash
+    def check(self, state):
+        self.state.update(state)
+        if len(self.inputs) % REPLAY_CHECK_INTERVAL == 0:
+            self.checkpoints.append(self.state.digest())
+
+    # Define a method that returns the hash of every state checked so far
+    def digest(self):
+        return self.state.digest()
+
+    # Define a method to create a script that presses the recorded keys, for Game.simulate and Game.replay
+    def script(self):
+        inputs = self.inputs
+        return lambda tick: decodeKeys(inputs[tick]) if tick < len(inputs) else ()
+
+    # Define a method to find the tick of the first checkpoint where another recording differs, or None if they match
+    def firstDifference(self, other):
+        for index, (mine, theirs) in enumerate(zip(self.checkpoints, other.checkpoints)):
+            if mine != theirs:
+                return (index + 1) * REPLAY_CHECK_INTERVAL
+        return None
+
+    # Define a method to save the recording to a file
+    def save(self, path):
+        inputs = zlib.compress(bytes(self.inputs), 9)
+        with open(path, "wb") as file:
+            file.write(self.header.pack(self.magic, self.version, self.seed, len(self.inputs), len(inputs), len(self.checkpoints)))
+            file.write(inputs)
+            file.write(b"".join(self.checkpoints))
+            file.write(self.digest())
+
+    # Define a method to load a recording from a file
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < cls.header.size:
+            raise ValueError(f"{path} is too short to be a replay file")
+
+        magic, version, seed, ticks, size, count = cls.header.unpack_from(data)
+        if magic != cls.magic or version != cls.version:
+            raise ValueError(f"{path} is not a version {cls.version} replay file")
+
+        offset = cls.header.size
+        inputs = zlib.decompress(data[offset:offset + size])
+        offset += size
+        checkpoints = [data[offset + i * cls.digest_size:offset + (i + 1) * cls.digest_size] for i in range(count)]
+        offset += count * cls.digest_size
+        final = data[offset:offset + cls.digest_size]
+        if len(inputs) != ticks or len(final) != cls.digest_size:
+            raise ValueError(f"{path} is a damaged replay file")
+        return cls(seed, inputs, checkpoints, final)
@@ -0,0 +1,58 @@
+#Import relevant libraries
+import pygame
+import random
+
+# Define a class for a scripted keyboard state that can be read like pygame.key.get_pressed()
+class KeyState:
+    # Initialize the state with the keys that are held down
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    # Define a method to check if a key is held down
+    def __getitem__(self, key):
+        return key in self.pressed
+
+# Define a class for sounds that are never heard, used when the game runs without audio
+class SilentSound:
+    # Define methods that do nothing for the parts of pygame.mixer.Sound the game uses
+    def play(self, loops=0):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+# Define a class for a record store that keeps nothing, used so simulated runs don't reach the leaderboard
+class NoRecords:
+    # Define methods that do nothing for the parts of RecordStore the game uses
+    def add(self, player, seconds):
+        pass
+
+    def flush(self):
+        pass
+
+    def top(self, count=None):
+        return []
+
+    def personalBest(self, player):
+        return None
+
+    def close(self):
+        pass
+
+# Define a function to create a script that walks around the maze at random
+def randomWalk(seed=None, hold=30):
+    rng = random.Random(seed)
+    directions = (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d)
+    state = {"key": None, "until": 0}
+
+    # Hold a random direction key (or nothing) for up to hold ticks at a time
+    def script(tick):
+        if tick >= state["until"]:
+            state["key"] = rng.choice(directions + (None,))
+            state["until"] = tick + rng.randint(1, hold)
+        return (state["key"],) if state["key"] is not None else ()
+
+    return script
@@ -0,0 +1,274 @@
+#Import relevant libraries
+import numpy as np
+import pygame
+from tiles import SpatialHash
+from config import *
+
+# Define a class for every enemy of a game, with their state kept in arrays and updated all at once
+class EnemySwarm:
+    # Directions as indexes into the arrays: left, right, up, down, and standing still for enemies that are shut in
+    step_x = np.array([-1, 1, 0, 0, 0])
+    step_y = np.array([0, 0, -1, 1, 0])
+    reverse = np.array([1, 0, 3, 2, 4])
+
+    # Animations for each direction, shared by every swarm and filled in by loadAnimations
+    animations = None
+
+    # Define a method to build the shared animations once from the spritesheet
+    @classmethod
+    def loadAnimations(cls, spritesheet):
+        # Skip if the animations have already been built
+        if cls.animations is not None:
+            return
+
+        # Rows of the spritesheet for left, right, up and down, three frames each
+        cls.animations = [[spritesheet.getSprite(x, y, RENDER_SIZE, RENDER_SIZE, REGULAR_RATIO) for x in (0, 32, 64)]
+                          for y in (64, 96, 32, 0)]
+
+    # Initialize the swarm for the grid of a level and its tiles enemies can walk on, with the random numbers
+    # that decide where enemies go and optionally a planner process that decides for them
+    def __init__(self, game, grid, open, seed=None, planner=None):
+        self.game = game
+        self.grid = grid
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.planner = planner
+        self.size = int(TILE_SIZE * REGULAR_RATIO)
+
+        # Walls, blocked ground and empty tiles stop enemies, shared with the distance field so the grid is only read once
+        self.open = open
+
+        # Sort the enemies into cells by their center so only the ones near a point have to be looked at
+        self.hash = SpatialHash(SPATIAL_CELL * TILE_SIZE)
+
+        # Position in pixels, direction and animation frame of every enemy
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.direction = np.zeros(0, dtype=np.int64)
+        self.animation_loop = np.zeros(0)
+        self.cell_rows = np.zeros(0, dtype=np.int64)
+        self.cell_columns = np.zeros(0, dtype=np.int64)
+        self.previous_x = np.zeros(0, dtype=np.int64)
+        self.previous_y = np.zeros(0, dtype=np.int64)
+
+    # Define a method to get how many enemies there are
+    def __len__(self):
+        return len(self.x)
+
+    # Define a method to add enemies on tiles given as (row, column)
+    def add(self, cells):
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        self.x = np.concatenate((self.x, cells[:, 1] * TILE_SIZE))
+        self.y = np.concatenate((self.y, cells[:, 0] * TILE_SIZE))
+        self.previous_x = np.concatenate((self.previous_x, cells[:, 1] * TILE_SIZE))
+        self.previous_y = np.concatenate((self.previous_y, cells[:, 0] * TILE_SIZE))
+        # Enemies start facing down, so the first way they won't turn back to is up
+        self.direction = np.concatenate((self.direction, np.full(len(cells), 3)))
+        self.animation_loop = np.concatenate((self.animation_loop, np.ones(len(cells))))
+        self.cell_rows = np.concatenate((self.cell_rows, np.full(len(cells), -1)))
+        self.cell_columns = np.concatenate((self.cell_columns, np.full(len(cells), -1)))
+        self.sortCells()
+
+    # Define a method to move every enemy up a number of pixels onto a new grid, dropping the enemies that end up above it or in its first row
+    def shift(self, grid, open, pixels):
+        self.grid = grid
+        self.open = open
+
+        keep = self.y >= pixels + TILE_SIZE
+        self.x = self.x[keep]
+        self.y = self.y[keep] - pixels
+        self.previous_x = self.previous_x[keep]
+        self.previous_y = self.previous_y[keep] - pixels
+        self.direction = self.direction[keep]
+        self.animation_loop = self.animation_loop[keep]
+
+        # Enemies are numbered again, so sort all of them into a new spatial hash
+        self.hash = SpatialHash(self.hash.cell_size)
+        self.cell_rows = np.full(len(self.x), -1)
+        self.cell_columns = np.full(len(self.x), -1)
+        self.sortCells()
+
+    # Define a method to send the maze to the planner with room for every enemy, once all of them are placed
+    def loadPlanner(self):
+        if self.planner:
+            self.planner.load(self.grid, len(self.x), self.seed)
+
+    # Define a method to remember where the enemies are before a tick, so frames between ticks can be drawn in between
+    def savePositions(self):
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+    # Define a method to get the positions of the enemies a fraction of the way from the last tick to this one
+    def positions(self, alpha=1):
+        if alpha == 1:
+            return self.x, self.y
+        return (np.rint(self.previous_x + (self.x - self.previous_x) * alpha).astype(np.int64),
+                np.rint(self.previous_y + (self.y - self.previous_y) * alpha).astype(np.int64))
+
+    # Define a method to move the enemies that walked into another cell of the spatial hash
+    def sortCells(self):
+        center_x = self.x + self.size // 2
+        center_y = self.y + self.size // 2
+        rows = center_y // self.hash.cell_size
+        columns = center_x // self.hash.cell_size
+        moved = np.flatnonzero((rows != self.cell_rows) | (columns != self.cell_columns))
+        for index, x, y in zip(moved.tolist(), center_x[moved].tolist(), center_y[moved].tolist()):
+            self.hash.move(index, x, y)
+        self.cell_rows = rows
+        self.cell_columns = columns
+
+    # Define a method to look up a value of the tile next to every enemy in every direction, with outside the grid given
+    @classmethod
+    def neighbours(cls, grid, rows, columns, outside):
+        next_rows = rows[:, None] + cls.step_y[:4]
+        next_columns = columns[:, None] + cls.step_x[:4]
+        inside = (next_rows >= 0) & (next_rows < grid.shape[0]) & (next_columns >= 0) & (next_columns < grid.shape[1])
+        values = grid[np.clip(next_rows, 0, grid.shape[0] - 1), np.clip(next_columns, 0, grid.shape[1] - 1)]
+        return np.where(inside, values, outside)
+
+    # Define a method to move every enemy one tick
+    def update(self):
+        if not len(self.x):
+            return
+
+        # Enemies keep walking the way they go until they are lined up with a tile, then pick where to go next
+        lined_up = np.flatnonzero((self.x % TILE_SIZE == 0) & (self.y % TILE_SIZE == 0))
+        if len(lined_up):
+            if self.planner:
+                self.followPlan(lined_up)
+            else:
+                self.choosePaths(lined_up)
+
+        # Step every enemy that has somewhere to go
+        self.x += self.step_x[self.direction] * ENEMY_SPEED
+        self.y += self.step_y[self.direction] * ENEMY_SPEED
+        self.sortCells()
+
+        # Tell the planner where everyone is now, it plans the next tile of every enemy while the game goes on
+        if self.planner:
+            player = self.game.player.rect
+            self.planner.send(self.x, self.y, self.direction, (player.centery // TILE_SIZE, player.centerx // TILE_SIZE))
+
+        # Play the walking animation
+        self.animation_loop += 0.1
+        self.animation_loop[self.animation_loop >= 3] = 1
+
+    # Define a method to choose the direction of the enemies that are lined up with a tile
+    def choosePaths(self, lined_up):
+        distances = self.game.distance_field.distances if ENEMY_PURSUIT else None
+        self.direction[lined_up] = self.planDirections(self.open, distances, self.y[lined_up] // TILE_SIZE, self.x[lined_up] // TILE_SIZE,
+                                                       self.direction[lined_up], self.rng)
+
+    # Define a method to choose the way enemies on some tiles go next, given the way they came, used by the game and the planner process
+    @classmethod
+    def planDirections(cls, open, distances, rows, columns, direction, rng):
+        open_ways = cls.neighbours(open, rows, columns, False)
+
+        # Don't turn back unless it's a dead end
+        allowed = np.concatenate((open_ways, np.zeros((len(rows), 1), dtype=bool)), axis=1)
+        allowed[np.arange(len(rows)), cls.reverse[direction]] = False
+        allowed = allowed[:, :4]
+        dead_end = ~allowed.any(axis=1)
+        allowed[dead_end] = open_ways[dead_end]
+
+        # Pick one of the allowed ways at random
+        choice = np.argmax(rng.random(allowed.shape) * allowed, axis=1)
+
+        # Hunting enemies take the way that brings them closer to the player instead, when there is one
+        if distances is not None:
+            distance = distances[np.clip(rows, 0, distances.shape[0] - 1), np.clip(columns, 0, distances.shape[1] - 1)]
+            closer = cls.neighbours(distances, rows, columns, -1) == (distance - 1)[:, None]
+            closer &= (distance > 0)[:, None]
+            hunting = closer.any(axis=1)
+            choice[hunting] = np.argmax(closer[hunting], axis=1)
+
+        # Enemies with no way to go at all stay where they are
+        choice[~open_ways.any(axis=1)] = 4
+        return choice
+
+    # Define a method to get the tile every enemy lines up with next, as arrays of rows and columns
+    @classmethod
+    def targets(cls, x, y, direction):
+        rows = np.where(cls.step_y[direction] > 0, -(-y // TILE_SIZE), y // TILE_SIZE)
+        columns = np.where(cls.step_x[direction] > 0, -(-x // TILE_SIZE), x // TILE_SIZE)
+        return rows, columns
+
+    # Define a method to turn the lined up enemies the way the planner decided, without ever waiting for it
+    def followPlan(self, lined_up):
+        rows = self.y[lined_up] // TILE_SIZE
+        columns = self.x[lined_up] // TILE_SIZE
+        direction = self.direction[lined_up]
+
+        # Until the planner has planned a tile, enemies keep walking the way they go, or stand still in front of a wall
+        open_ways = self.neighbours(self.open, rows, columns, False)
+        ahead = open_ways[np.arange(len(lined_up)), np.minimum(direction, 3)] & (direction < 4)
+        choice = np.where(ahead, direction, 4)
+
+        # Take the planned way for the enemies the last plan was made for this tile
+        plan = self.planner.plan()
+        if plan is not None:
+            known = np.flatnonzero(lined_up < plan.shape[1])
+            index = lined_up[known]
+            planned = known[(plan[0, index] == rows[known]) & (plan[1, index] == columns[known])]
+            choice[planned] = plan[2, lined_up[planned]]
+        self.direction[lined_up] = choice
+
+    # Define a method to check if any enemy touches a rect
+    def collide(self, rect):
+        # Only enemies with their center within half an enemy of the rect can touch it
+        near = np.array(self.hash.query(rect.inflate(self.size, self.size)), dtype=np.int64)
+        return bool(np.any((self.x[near] < rect.right) & (self.x[near] + self.size > rect.left) &
+                           (self.y[near] < rect.bottom) & (self.y[near] + self.size > rect.top)))
+
+    # Define a method to get the distances in pixels from a point to the centers of some enemies
+    def distances(self, x, y, indexes):
+        return np.hypot(self.x[indexes] + self.size // 2 - x, self.y[indexes] + self.size // 2 - y)
+
+    # Define a method to get the enemies within a radius of a point, as arrays of indexes and distances in pixels
+    def within(self, x, y, radius):
+        near = np.array(self.hash.query(pygame.Rect(x - radius, y - radius, 2 * radius + 1, 2 * radius + 1)), dtype=np.int64)
+        distances = self.distances(x, y, near)
+        inside = distances <= radius
+        return near[inside], distances[inside]
+
+    # Define a method to get the nearest enemies to a point, closest first, as arrays of indexes and distances in pixels
+    def nearest(self, x, y, count, radius=None):
+        # Measuring every enemy at once is faster than looking through the cells around the point, unless there are many
+        if radius is not None and len(self) > NEAREST_BRUTE_FORCE:
+            indexes, distances = self.within(x, y, radius)
+        else:
+            indexes = np.arange(len(self))
+            distances = self.distances(x, y, indexes)
+            if radius is not None:
+                inside = distances <= radius
+                indexes, distances = indexes[inside], distances[inside]
+
+        # Only sort the closest few
+        if 0 < count < len(distances):
+            closest = np.argpartition(distances, count - 1)[:count]
+            indexes, distances = indexes[closest], distances[closest]
+        order = np.argsort(distances, kind="stable")[:count]
+        return indexes[order], distances[order]
+
+    # Define a method to get the indexes of the enemies inside a part of the world, and their screen positions
+    def visible(self, camera, alpha=1):
+        x, y = self.positions(alpha)
+        view = camera.rect
+        shown = np.flatnonzero((x < view.right) & (x + self.size > view.left) & (y < view.bottom) & (y + self.size > view.top))
+        return shown, (x[shown] - view.x).tolist(), (y[shown] - view.y).tolist()
+
+    # Define a method to get where the enemies in view are on the screen
+    def screenRects(self, camera, alpha=1):
+        _, xs, ys = self.visible(camera, alpha)
+        return [pygame.Rect(x, y, self.size, self.size) for x, y in zip(xs, ys)]
+
+    # Define a method to draw the enemies in view, shifted by the camera
+    def draw(self, screen, camera, alpha=1):
+        shown, xs, ys = self.visible(camera, alpha)
+        frames = np.minimum(self.direction[shown], 3).tolist()
+        loops = self.animation_loop[shown].astype(int).tolist()
+        screen.blits([(self.animations[frame][loop], (x, y)) for frame, loop, x, y in zip(frames, loops, xs, ys)], False)
+
+    # Define a method to get the state of every enemy as bytes, for checking replays
+    def state(self):
+        return self.x.tobytes() + self.y.tobytes()
@@ -0,0 +1,37 @@
+#Import relevant libraries
+import random
+import pygame
+from maze import generateMaze
+from tiles import CollisionGrid
+from config import *
+
+# Define a function to build a sprite on every wall tile of a grid, in the order the tilemap is built
+def wallSprites(grid):
+    group = pygame.sprite.Group()
+    for row, column in zip(*(grid == 0).nonzero()):
+        sprite = pygame.sprite.Sprite(group)
+        sprite.rect = pygame.Rect(column * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    return group
+
+# Define a test that the collision grid finds the same walls in the same order as checking every wall sprite
+def test_collide_matches_spritecollide():
+    rng = random.Random(0)
+    probe = pygame.sprite.Sprite()
+    for seed in range(5):
+        rows, columns = rng.randrange(3, 30), rng.randrange(3, 30)
+        grid = generateMaze(rows, columns, (0, 0), seed)
+        # Block some of the paths, those tiles aren't walls
+        paths = (grid == 1).nonzero()
+        for index in rng.sample(range(len(paths[0])), len(paths[0]) // 5):
+            grid[paths[0][index], paths[1][index]] = 2
+        walls = wallSprites(grid)
+        collision = CollisionGrid(grid, 0)
+
+        for _ in range(2000):
+            # Rects of any size, some of them partly or fully outside the maze
+            width, height = rng.randrange(0, 3 * TILE_SIZE), rng.randrange(0, 3 * TILE_SIZE)
+            x = rng.randrange(-2 * TILE_SIZE, columns * TILE_SIZE + TILE_SIZE)
+            y = rng.randrange(-2 * TILE_SIZE, rows * TILE_SIZE + TILE_SIZE)
+            probe.rect = pygame.Rect(x, y, width, height)
+            expected = [sprite.rect for sprite in pygame.sprite.spritecollide(probe, walls, False)]
+            assert collision.collide(probe.rect) == expected, (seed, probe.rect)
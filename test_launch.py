@@ -0,0 +1,11 @@
+#Import relevant libraries
+from benchmark import launch
+
+# How long starting the game may take before the intro screen shows, in milliseconds
+LAUNCH_BUDGET = 1000
+
+# Define a test that a new process gets to the first frame of the intro screen within the budget
+def test_launch_to_intro_screen():
+    # Take the fastest of a few launches so a busy machine doesn't fail the test
+    fastest = min(launch() for _ in range(3))
+    assert fastest < LAUNCH_BUDGET, f"The intro screen took {fastest:.0f} ms to show"
@@ -0,0 +1,30 @@
+#Import relevant libraries
+import numpy as np
+import pytest
+from maze import Level, EndlessLevel, generateMaze
+
+# Define a test that a level without a finish line, like an endless one, can be saved and opened again
+def test_save_and_load_without_finish(tmp_path):
+    path = str(tmp_path / "endless.lvl")
+    level = EndlessLevel(3)
+    level.save(path)
+    loaded = Level.load(path)
+    assert (np.asarray(loaded.grid) == level.grid).all()
+    assert loaded.player == level.player and loaded.enemy == level.enemy
+    assert loaded.finish_row is None
+
+# Define a test that a level keeps its finish line when saved
+def test_save_and_load_with_finish(tmp_path):
+    path = str(tmp_path / "maze.lvl")
+    Level(generateMaze(9, 9, (0, 0), 1), (0, 0), (8, 8), 7).save(path)
+    assert Level.load(path).finish_row == 7
+
+# Define a test that tilemaps without both spawns are rejected
+def test_tilemap_needs_spawns():
+    assert Level.fromTilemap(["P1", "1E"]).enemy == (1, 1)
+    with pytest.raises(ValueError, match="player spawn"):
+        Level.fromTilemap(["11", "1E"])
+    with pytest.raises(ValueError, match="enemy spawn"):
+        Level.fromTilemap(["P1", "11"])
+    with pytest.raises(ValueError, match="spawn"):
+        Level(np.ones((2, 2), dtype=np.uint8), (0, 0), None).save("unused.lvl")
@@ -0,0 +1,38 @@
+#Import relevant libraries
+import sqlite3
+import threading
+from records import RecordStore
+
+# Define a test that the leaderboard keeps the fastest runs and the personal best of a player
+def test_top_and_personal_best(tmp_path):
+    records = RecordStore(str(tmp_path / "records.db"))
+    for player, seconds in (("ann", 80.0), ("bob", 60.0), ("ann", 70.0)):
+        records.add(player, seconds)
+    records.flush()
+    assert records.top(2) == [("bob", 60.0), ("ann", 70.0)]
+    assert records.personalBest("ann") == 70.0
+    assert records.personalBest("cat") is None
+    records.close()
+
+# Define a test that a run that can't be written doesn't make flush wait forever
+def test_flush_returns_when_writing_fails(tmp_path):
+    path = str(tmp_path / "records.db")
+    records = RecordStore(path)
+
+    # Break the database under the writer so the insert raises
+    connection = sqlite3.connect(path)
+    connection.execute("DROP TABLE runs")
+    connection.commit()
+    connection.close()
+    records.add("ann", 70.0)
+
+    flushing = threading.Thread(target=records.flush, daemon=True)
+    flushing.start()
+    flushing.join(5)
+    assert not flushing.is_alive()
+
+    # The writer keeps going after the error and stops when the store is closed
+    records.add("bob", 60.0)
+    records.flush()
+    records.close()
+    assert not records.writer.is_alive()
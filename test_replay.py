@@ -0,0 +1,52 @@
+#Import relevant libraries
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+import pytest
+from main import Game
+from replay import Recording
+from simulation import randomWalk
+from config import *
+
+# Define a fixture for a game without a window, sound or planner, run from the folder with its images and fonts
+@pytest.fixture(scope="module")
+def game():
+    folder = os.getcwd()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    yield Game(headless=True, planner=False)
+    os.chdir(folder)
+
+# Define a function to play a seeded game with random steering and return its recording, as saved and loaded again
+def record(game, path, ticks=4000, seed=5):
+    game.script = randomWalk(seed)
+    game.new(seed=seed)
+    for game.tick in range(ticks):
+        if not game.playing:
+            break
+        game.frame(draw=False)
+    game.script = None
+    game.recording.save(path)
+    return Recording.load(path)
+
+# Define a test that replaying the recorded input plays the game out exactly the same
+def test_replay_matches(game, tmp_path):
+    recording = record(game, str(tmp_path / "run.replay"))
+    result = game.replay(recording)
+    assert result["matches"]
+    assert result["diverged_at"] is None
+
+# Define a test that a changed input is caught at the first checkpoint after it
+def test_changed_input_diverges(game, tmp_path):
+    recording = record(game, str(tmp_path / "run.replay"))
+    tick = 130
+    # Let go of the keys for one tick, or hold W if none were held
+    recording.inputs[tick] = 0 if recording.inputs[tick] else 1
+    result = game.replay(recording)
+    assert not result["matches"]
+    assert result["diverged_at"] == (tick // REPLAY_CHECK_INTERVAL + 1) * REPLAY_CHECK_INTERVAL
+
+# Define a test that simulating counts the ticks that ran
+def test_simulate_counts_ticks(game):
+    assert game.simulate(0, randomWalk(1))["ticks"] == 0
+    result = game.simulate(50, randomWalk(1), restart=False)
+    assert result["ticks"] == len(game.recording.inputs) == 50
@@ -0,0 +1,48 @@
+#Import relevant libraries
+import random
+import numpy as np
+import pygame
+from maze import generateMaze
+from swarm import EnemySwarm
+from tiles import DistanceField
+from config import *
+
+# Define a function to make a swarm with enemies anywhere on a maze, not only on whole tiles
+def scatteredSwarm(rng, count, size=40):
+    grid = generateMaze(size, size, (0, 0), 0)
+    swarm = EnemySwarm(None, grid, DistanceField(grid).open)
+    swarm.add([(0, 0)] * count)
+    swarm.x[:] = [rng.randrange(size * TILE_SIZE) for _ in range(count)]
+    swarm.y[:] = [rng.randrange(size * TILE_SIZE) for _ in range(count)]
+    swarm.sortCells()
+    return swarm
+
+# Define a test that the spatial hash lookups find the same enemies as measuring every enemy
+def test_lookups_match_brute_force():
+    rng = random.Random(0)
+    # Few enemies are measured directly, many are found through the spatial hash
+    for count in (1, 20, NEAREST_BRUTE_FORCE + 300):
+        swarm = scatteredSwarm(rng, count)
+        centers_x = swarm.x + swarm.size // 2
+        centers_y = swarm.y + swarm.size // 2
+
+        for _ in range(300):
+            x, y = rng.randrange(40 * TILE_SIZE), rng.randrange(40 * TILE_SIZE)
+            radius = rng.randrange(1, 12 * TILE_SIZE)
+            distances = np.hypot(centers_x - x, centers_y - y)
+
+            indexes, found = swarm.within(x, y, radius)
+            assert sorted(indexes.tolist()) == np.flatnonzero(distances <= radius).tolist()
+            assert np.allclose(found, distances[indexes])
+
+            wanted = rng.randrange(1, 6)
+            expected = np.sort(distances[distances <= radius])[:wanted]
+            indexes, found = swarm.nearest(x, y, wanted, radius)
+            assert np.allclose(found, expected)
+            assert np.allclose(distances[indexes], found)
+            assert np.allclose(swarm.nearest(x, y, wanted)[1], np.sort(distances)[:wanted])
+
+            rect = pygame.Rect(x, y, rng.randrange(1, 2 * TILE_SIZE), rng.randrange(1, 2 * TILE_SIZE))
+            touching = ((swarm.x < rect.right) & (swarm.x + swarm.size > rect.left) &
+                        (swarm.y < rect.bottom) & (swarm.y + swarm.size > rect.top))
+            assert swarm.collide(rect) == bool(touching.any())
@@ -0,0 +1,234 @@
+#Import relevant libraries
+import pygame
+import numpy as np
+from config import *
+from collections import OrderedDict, deque
+
+# Define a class for the static floor and walls, pre-rendered in chunks
+class TileLayer:
+    # Initialize the layer with the grid of a level and the images for floor and wall tiles
+    def __init__(self, grid, floor_image, wall_image):
+        self.grid = grid
+        self.floor_image = floor_image
+        self.wall_image = wall_image
+
+        # Size of the map in tiles
+        self.rows, self.columns = grid.shape
+
+        # Size of a chunk in pixels
+        self.chunk_pixels = CHUNK_SIZE * TILE_SIZE
+
+        # Baked chunk surfaces, oldest first so the least recently drawn can be dropped
+        self.chunks = OrderedDict()
+
+    # Define a method to get the surface of a chunk, baking it the first time it is needed
+    def getChunk(self, chunk_x, chunk_y):
+        key = (chunk_x, chunk_y)
+        if key in self.chunks:
+            # Mark the chunk as recently used
+            self.chunks.move_to_end(key)
+            return self.chunks[key]
+
+        chunk = self.bakeChunk(chunk_x, chunk_y)
+        self.chunks[key] = chunk
+
+        # Drop the least recently used chunk when the cache is full
+        if len(self.chunks) > CHUNK_CACHE_SIZE:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    # Define a method to render every tile of a chunk onto a single surface
+    def bakeChunk(self, chunk_x, chunk_y):
+        chunk = pygame.Surface((self.chunk_pixels, self.chunk_pixels)).convert()
+        chunk.fill(BLACK)
+
+        # Only read the tiles of this chunk from the grid
+        first_row = chunk_y * CHUNK_SIZE
+        first_column = chunk_x * CHUNK_SIZE
+        tiles = self.grid[first_row:first_row + CHUNK_SIZE, first_column:first_column + CHUNK_SIZE].tolist()
+
+        for i, row in enumerate(tiles):
+            for j, tile in enumerate(row):
+                # Leave empty tiles black
+                if tile == VOID_TILE:
+                    continue
+                position = (j * TILE_SIZE, i * TILE_SIZE)
+                # Every tile has floor below it, walls are drawn on top
+                chunk.blit(self.floor_image, position)
+                if tile == 0:
+                    chunk.blit(self.wall_image, position)
+        return chunk
+
+    # Define a method to move the layer up a number of rows onto a new grid, keeping the baked chunks that are still right
+    def shift(self, grid, rows):
+        old_rows = self.rows
+        self.grid = grid
+        self.rows, self.columns = grid.shape
+        if rows % CHUNK_SIZE:
+            self.chunks.clear()
+            return
+
+        # Chunks cut off by the bottom of the old grid, or moved onto the first row, which may have changed, are baked again
+        moved = rows // CHUNK_SIZE
+        self.chunks = OrderedDict(((chunk_x, chunk_y - moved), chunk) for (chunk_x, chunk_y), chunk in self.chunks.items()
+                                  if chunk_y > moved and (chunk_y + 1) * CHUNK_SIZE <= old_rows)
+
+    # Define a method to find the chunks that intersect a rect in world coordinates
+    def visibleChunks(self, view):
+        # Find the range of chunks that intersect the view, clipped to the map
+        first_x = max(view.left // self.chunk_pixels, 0)
+        first_y = max(view.top // self.chunk_pixels, 0)
+        last_x = min((view.right - 1) // self.chunk_pixels, (self.columns - 1) // CHUNK_SIZE)
+        last_y = min((view.bottom - 1) // self.chunk_pixels, (self.rows - 1) // CHUNK_SIZE)
+
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                yield chunk_x, chunk_y
+
+    # Define a method to bake the chunks of a view ahead of time
+    def bakeView(self, view):
+        for chunk_x, chunk_y in self.visibleChunks(view):
+            self.getChunk(chunk_x, chunk_y)
+
+    # Define a method to draw the chunks that are visible through the camera
+    def draw(self, screen, camera):
+        view = camera.rect
+        for chunk_x, chunk_y in self.visibleChunks(view):
+            position = (chunk_x * self.chunk_pixels - view.x, chunk_y * self.chunk_pixels - view.y)
+            screen.blit(self.getChunk(chunk_x, chunk_y), position)
+
+# Define a class that finds the tiles of one kind a rect runs into by reading the grid of the level, no sprite is needed per tile
+class CollisionGrid:
+    # Number of tiles checked by every grid, read and reset by the profiler
+    checks = 0
+
+    # Initialize the grid for the tiles with a code (0 wall, 2 blocked ground) in the grid of a level
+    def __init__(self, grid, code):
+        self.grid = grid
+        self.code = code
+
+    # Define a method to get the rects of the tiles that collide with a rect
+    def collide(self, rect):
+        hits = []
+        if rect.width <= 0 or rect.height <= 0:
+            return hits
+        rows, columns = self.grid.shape
+
+        # Only look at the tiles the rect overlaps, row by row like the tilemap is built
+        for row in range(max(rect.top // TILE_SIZE, 0), min((rect.bottom - 1) // TILE_SIZE + 1, rows)):
+            for column in range(max(rect.left // TILE_SIZE, 0), min((rect.right - 1) // TILE_SIZE + 1, columns)):
+                CollisionGrid.checks += 1
+                if self.grid[row, column] == self.code:
+                    hits.append(pygame.Rect(column * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        return hits
+
+# Define a class that sorts moving actors into square cells, so only the cells near a point have to be searched
+class SpatialHash:
+    # Initialize an empty hash with the size of a cell in pixels
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        # Actor keys by (row, column) of their cell, and the cell of every key
+        self.buckets = {}
+        self.cells = {}
+
+    # Define a method to get the cell of a point
+    def cell(self, x, y):
+        return (y // self.cell_size, x // self.cell_size)
+
+    # Define a method to put an actor in the cell of a point, moving it out of its old cell
+    def move(self, key, x, y):
+        cell = self.cell(x, y)
+        old = self.cells.get(key)
+        if old == cell:
+            return
+        if old is not None:
+            self.buckets[old].discard(key)
+        self.buckets.setdefault(cell, set()).add(key)
+        self.cells[key] = cell
+
+    # Define a method to get the keys in the cells that overlap a rect
+    def query(self, rect):
+        keys = []
+        for row in range(rect.top // self.cell_size, (rect.bottom - 1) // self.cell_size + 1):
+            for column in range(rect.left // self.cell_size, (rect.right - 1) // self.cell_size + 1):
+                keys.extend(self.buckets.get((row, column), ()))
+        return keys
+
+# Define a class for the distance of every reachable tile to the player, used by hunting enemies
+class DistanceField:
+    # Directions an enemy can step in, with the change in (row, column)
+    steps = (("left", 0, -1), ("right", 0, 1), ("up", -1, 0), ("down", 1, 0))
+    # Whether enemies can walk on a tile, by tile code, so the open tiles of a grid are looked up in one pass
+    passable_codes = np.ones(256, dtype=bool)
+    passable_codes[[0, 2, VOID_TILE]] = False
+
+    # Initialize the field for the grid of a level
+    def __init__(self, grid):
+        self.grid = grid
+        # Walls, blocked ground and empty tiles stop enemies
+        self.open = DistanceField.passable_codes[grid]
+        # One byte per tile, faster to index one at a time than the array
+        self.open_tiles = self.open.tobytes()
+        # The tile the distances are measured from
+        self.source = None
+        # Distances by [row, column], -1 for tiles that can't reach the source or are further than PURSUIT_RANGE from it
+        self.distances = np.full(grid.shape, -1, dtype=np.int32)
+        # Flat indexes of the tiles that have a distance, the only ones that have to be cleared when the source moves
+        self.reached = np.zeros(0, dtype=np.intp)
+
+    # Define a method to check if an enemy can walk on a tile
+    def passable(self, row, column):
+        if 0 <= row < self.grid.shape[0] and 0 <= column < self.grid.shape[1]:
+            return bool(self.open[row, column])
+        return False
+
+    # Define a method to recompute the distances when the source moves to another tile
+    def update(self, source):
+        if source == self.source:
+            return
+        self.source = source
+        rows, columns = self.grid.shape
+        distances = {}
+
+        # Breadth-first search outwards from the source up to PURSUIT_RANGE tiles away, so the cost doesn't grow with the maze
+        row, column = source
+        if 0 <= row < rows and 0 <= column < columns:
+            distances[row * columns + column] = 0
+            queue = deque([row * columns + column])
+            open_tiles = self.open_tiles
+            while queue:
+                index = queue.popleft()
+                distance = distances[index] + 1
+                if distance > PURSUIT_RANGE:
+                    break
+                row, column = divmod(index, columns)
+                for cell, inside in ((index - 1, column > 0), (index + 1, column < columns - 1),
+                                     (index - columns, row > 0), (index + columns, row < rows - 1)):
+                    if inside and open_tiles[cell] and cell not in distances:
+                        distances[cell] = distance
+                        queue.append(cell)
+
+        # Clear the tiles the last search reached and write the new distances into the same array
+        flat = self.distances.reshape(-1)
+        flat[self.reached] = -1
+        self.reached = np.fromiter(distances.keys(), dtype=np.intp, count=len(distances))
+        flat[self.reached] = np.fromiter(distances.values(), dtype=np.int32, count=len(distances))
+
+    # Define a method to get the distance of a tile to the source, or -1 if it can't reach it
+    def distance(self, row, column):
+        if 0 <= row < self.grid.shape[0] and 0 <= column < self.grid.shape[1]:
+            return int(self.distances[row, column])
+        return -1
+
+    # Define a method to get the direction that brings a tile one step closer to the source
+    def nextStep(self, cell):
+        distance = self.distance(*cell)
+        # Nothing to do on the source or on tiles that can't reach it
+        if distance <= 0:
+            return None
+
+        row, column = cell
+        for direction, d_row, d_column in self.steps:
+            if self.distance(row + d_row, column + d_column) == distance - 1:
+                return direction
+        return None
@@ -0,0 +1,73 @@
+#Import relevant libraries
+import time
+import pygame
+from config import *
+
+# Define a function to decode a video into a clip of small frames, runs on the background asset loader
+def loadClip(path, size=JUMPSCARE_SIZE, fps=JUMPSCARE_FPS):
+    # moviepy pulls in imageio and the ffmpeg plumbing, so it is only imported once a video is loaded
+    from moviepy.editor import VideoFileClip
+    video = VideoFileClip(path, audio=False)
+
+    # Shrink every frame so the whole clip fits in memory, it is scaled up again when it is shown
+    frames = []
+    for frame in video.iter_frames(fps=fps, dtype="uint8"):
+        image = pygame.image.frombytes(frame.tobytes(), video.size, "RGB")
+        frames.append(pygame.transform.smoothscale(image, size))
+    video.close()
+    return FrameClip(frames, fps)
+
+# Define a class for the decoded frames of a video
+class FrameClip:
+    def __init__(self, frames, fps):
+        self.frames = frames
+        self.fps = fps
+        self.duration = len(frames) / fps
+
+    # Define a method that returns how many bytes the frames take up
+    def size(self):
+        return sum(frame.get_bytesize() * frame.get_width() * frame.get_height() for frame in self.frames)
+
+# Define a class that plays a clip on the screen as a timed sequence of blits, with its sound
+class ClipPlayer:
+    def __init__(self, clip, sound=None):
+        self.clip = clip
+        self.sound = sound
+        self.start_time = None
+        self.shown = None
+        self.scaled = None
+
+    # Define a method to start playing the clip from its first frame
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.shown = None
+        if self.sound:
+            self.sound.play()
+
+    # Define a method to check if the clip has played to its end
+    def finished(self):
+        return self.start_time is None or time.perf_counter() - self.start_time >= self.clip.duration
+
+    # Define a method to draw the frame for the time since the clip started, returns False once it has ended
+    def draw(self, screen):
+        if self.start_time is None:
+            return False
+
+        # Read the clock once, so the clip can't end between checking for the end and picking the frame
+        played = time.perf_counter() - self.start_time
+        if played >= self.clip.duration:
+            self.start_time = None
+            return False
+
+        # Pick the frame by the time played so the picture keeps up with the sound
+        index = min(int(played * self.clip.fps), len(self.clip.frames) - 1)
+
+        # Only scale a frame up to the screen once, it may be shown for several game frames
+        if index != self.shown:
+            if self.scaled is None:
+                self.scaled = pygame.transform.scale(self.clip.frames[index], screen.get_size())
+            else:
+                pygame.transform.scale(self.clip.frames[index], screen.get_size(), self.scaled)
+            self.shown = index
+        screen.blit(self.scaled, (0, 0))
+        return True